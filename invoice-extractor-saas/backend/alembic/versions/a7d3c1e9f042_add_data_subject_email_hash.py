@@ -0,0 +1,32 @@
+"""Add blind index column for data subject email lookups
+
+Existing rows need their hash computed from the encrypted email with the
+application keys: run scripts/backfill_data_subject_email_hash.py after this
+migration and before deploying the code that looks subjects up by email_hash.
+
+Revision ID: a7d3c1e9f042
+Revises: sub_001
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c1e9f042'
+down_revision = 'sub_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add email_hash blind index to data_subjects"""
+    op.add_column('data_subjects', sa.Column('email_hash', sa.String(64), nullable=True))
+    op.create_index('ix_data_subjects_email_hash', 'data_subjects', ['email_hash'])
+
+
+def downgrade():
+    """Remove email_hash blind index from data_subjects"""
+    op.drop_index('ix_data_subjects_email_hash', table_name='data_subjects')
+    op.drop_column('data_subjects', 'email_hash')
@@ -15,10 +15,10 @@ from models.user import User
 from core.database import get_db
 from crud.invoice import get_invoice_by_id, get_extracted_data
 from schemas.invoice import InvoiceData, FrenchBusinessInfo, FrenchTVABreakdown, LineItem
-from api.exports.sage_exporter import export_to_sage_pnm, export_batch_to_sage_pnm
-from api.exports.ebp_exporter import export_to_ebp_ascii, export_batch_to_ebp_ascii
+from api.exports.sage_exporter import export_to_sage_pnm_bytes, export_batch_to_sage_pnm_bytes
+from api.exports.ebp_exporter import export_to_ebp_ascii_bytes, export_batch_to_ebp_ascii_bytes
 from api.exports.ciel_exporter import export_to_ciel_ximport, export_batch_to_ciel_ximport
-from api.exports.fec_exporter import export_to_fec, export_batch_to_fec
+from api.exports.fec_exporter import export_to_fec, export_batch_to_fec_bytes
 
 router = APIRouter()
 
@@ -524,14 +524,14 @@ async def export_sage(
     invoice_data = await get_real_invoice_data(invoice_id, current_user.id, db)
     
     # Export to Sage PNM format
-    sage_content = export_to_sage_pnm(invoice_data)
+    sage_content = export_to_sage_pnm_bytes(invoice_data)
     
     return StreamingResponse(
-        io.BytesIO(sage_content.encode('utf-8')),
-        media_type="text/plain; charset=utf-8",
+        io.BytesIO(sage_content),
+        media_type="text/plain; charset=windows-1252",
         headers={
             "Content-Disposition": f"attachment; filename=facture_{invoice_id}_sage.pnm",
-            "Content-Type": "text/plain; charset=utf-8"
+            "Content-Type": "text/plain; charset=windows-1252"
         }
     )
 
@@ -548,14 +548,14 @@ async def export_ebp(
     invoice_data = await get_real_invoice_data(invoice_id, current_user.id, db)
     
     # Export to EBP ASCII format
-    ebp_content = export_to_ebp_ascii(invoice_data)
+    ebp_content = export_to_ebp_ascii_bytes(invoice_data)
     
     return StreamingResponse(
-        io.BytesIO(ebp_content.encode('utf-8')),
-        media_type="text/plain; charset=utf-8",
+        io.BytesIO(ebp_content),
+        media_type="text/plain; charset=windows-1252",
         headers={
             "Content-Disposition": f"attachment; filename=facture_{invoice_id}_ebp.txt",
-            "Content-Type": "text/plain; charset=utf-8"
+            "Content-Type": "text/plain; charset=windows-1252"
         }
     )
 
@@ -679,23 +679,23 @@ async def export_batch(
     
     # Handle accounting software formats that produce single files
     if format == "sage":
-        batch_content = export_batch_to_sage_pnm(invoices)
+        batch_content = export_batch_to_sage_pnm_bytes(invoices)
         return StreamingResponse(
-            io.BytesIO(batch_content.encode('utf-8')),
-            media_type="text/plain; charset=utf-8",
+            io.BytesIO(batch_content),
+            media_type="text/plain; charset=windows-1252",
             headers={
                 "Content-Disposition": f"attachment; filename=export_sage_{datetime.now().strftime('%Y%m%d')}.pnm",
-                "Content-Type": "text/plain; charset=utf-8"
+                "Content-Type": "text/plain; charset=windows-1252"
             }
         )
     elif format == "ebp":
-        batch_content = export_batch_to_ebp_ascii(invoices)
+        batch_content = export_batch_to_ebp_ascii_bytes(invoices)
         return StreamingResponse(
-            io.BytesIO(batch_content.encode('utf-8')),
-            media_type="text/plain; charset=utf-8",
+            io.BytesIO(batch_content),
+            media_type="text/plain; charset=windows-1252",
             headers={
                 "Content-Disposition": f"attachment; filename=export_ebp_{datetime.now().strftime('%Y%m%d')}.txt",
-                "Content-Type": "text/plain; charset=utf-8"
+                "Content-Type": "text/plain; charset=windows-1252"
             }
         )
     elif format == "ciel":
@@ -709,9 +709,9 @@ async def export_batch(
             }
         )
     elif format == "fec":
-        batch_content = export_batch_to_fec(invoices, journal_code)
+        batch_content = export_batch_to_fec_bytes(invoices, journal_code)
         return StreamingResponse(
-            io.BytesIO(batch_content.encode('utf-8')),
+            io.BytesIO(batch_content),
             media_type="text/plain; charset=utf-8",
             headers={
                 "Content-Disposition": f"attachment; filename=export_fec_{datetime.now().strftime('%Y%m%d')}.txt",
@@ -1123,10 +1123,10 @@ async def export_json_content(invoice_data: InvoiceData, invoice_id: str):
 
 async def export_sage_content(invoice_data: InvoiceData, invoice_id: str):
     """Generate Sage export content"""
-    sage_content = export_to_sage_pnm(invoice_data)
+    sage_content = export_to_sage_pnm_bytes(invoice_data)
     return StreamingResponse(
-        io.BytesIO(sage_content.encode('utf-8')),
-        media_type="text/plain; charset=utf-8",
+        io.BytesIO(sage_content),
+        media_type="text/plain; charset=windows-1252",
         headers={
             "Content-Disposition": f"attachment; filename=facture_approuvee_{invoice_id}_sage.pnm",
         }
@@ -1135,10 +1135,10 @@ async def export_sage_content(invoice_data: InvoiceData, invoice_id: str):
 
 async def export_ebp_content(invoice_data: InvoiceData, invoice_id: str):
     """Generate EBP export content"""
-    ebp_content = export_to_ebp_ascii(invoice_data)
+    ebp_content = export_to_ebp_ascii_bytes(invoice_data)
     return StreamingResponse(
-        io.BytesIO(ebp_content.encode('utf-8')),
-        media_type="text/plain; charset=utf-8",
+        io.BytesIO(ebp_content),
+        media_type="text/plain; charset=windows-1252",
         headers={
             "Content-Disposition": f"attachment; filename=facture_approuvee_{invoice_id}_ebp.txt",
         }
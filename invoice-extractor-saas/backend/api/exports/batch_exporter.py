@@ -447,7 +447,7 @@ class BatchExporter:
     
     async def _export_to_sage(self, processed_data: List[Dict], output_dir: str, timestamp: str) -> str:
         """Export to Sage PNM format with duplicate prevention (CRITICAL for accounting)"""
-        from api.exports.sage_exporter import export_batch_to_sage_pnm
+        from api.exports.sage_exporter import export_batch_to_sage_pnm_bytes
         
         # CRITICAL: Deduplicate invoices to prevent Sage PNM accounting errors
         try:
@@ -490,51 +490,51 @@ class BatchExporter:
         sage_path = os.path.join(output_dir, f"export_sage_{timestamp}.pnm")
         invoice_data_list = [item["data"] for item in processed_data]
         
-        sage_content = export_batch_to_sage_pnm(invoice_data_list)
+        sage_content = export_batch_to_sage_pnm_bytes(invoice_data_list)
         
-        with open(sage_path, 'w', encoding='utf-8') as f:
+        # Already encoded as Windows-1252 for Sage 100
+        with open(sage_path, 'wb') as f:
             f.write(sage_content)
         
         return sage_path
     
     async def _export_to_ebp(self, processed_data: List[Dict], output_dir: str, timestamp: str) -> str:
         """Export to EBP ASCII format"""
-        from api.exports.ebp_exporter import export_batch_to_ebp_ascii
+        from api.exports.ebp_exporter import export_batch_to_ebp_ascii_bytes
         
         ebp_path = os.path.join(output_dir, f"export_ebp_{timestamp}.txt")
         invoice_data_list = [item["data"] for item in processed_data]
         
-        ebp_content = export_batch_to_ebp_ascii(invoice_data_list)
+        ebp_content = export_batch_to_ebp_ascii_bytes(invoice_data_list)
         
-        with open(ebp_path, 'w', encoding='utf-8') as f:
+        # Already encoded as Windows-1252 for EBP
+        with open(ebp_path, 'wb') as f:
             f.write(ebp_content)
         
         return ebp_path
     
     async def _export_to_ciel(self, processed_data: List[Dict], output_dir: str, timestamp: str) -> str:
         """Export to Ciel XIMPORT format"""
-        from api.exports.ciel_exporter import export_batch_to_ciel_ximport
+        from api.exports.ciel_exporter import CielExporter
         
         ciel_path = os.path.join(output_dir, f"export_ciel_{timestamp}.txt")
         invoice_data_list = [item["data"] for item in processed_data]
         
-        ciel_content = export_batch_to_ciel_ximport(invoice_data_list)
-        
-        with open(ciel_path, 'w', encoding='utf-8') as f:
-            f.write(ciel_content)
+        # Written in UTF-8 chunks rather than built as one string first
+        with open(ciel_path, 'wb') as f:
+            CielExporter().stream_export_batch(invoice_data_list, f)
         
         return ciel_path
     
     async def _export_to_fec(self, processed_data: List[Dict], output_dir: str, timestamp: str) -> str:
         """Export to FEC format"""
-        from api.exports.fec_exporter import export_batch_to_fec
+        from api.exports.fec_exporter import FECExporter
         
         fec_path = os.path.join(output_dir, f"export_fec_{timestamp}.txt")
         invoice_data_list = [item["data"] for item in processed_data]
         
-        fec_content = export_batch_to_fec(invoice_data_list, "ACH")  # Default journal code
-        
-        with open(fec_path, 'w', encoding='utf-8') as f:
-            f.write(fec_content)
+        # Written in UTF-8 chunks rather than built as one export first
+        with open(fec_path, 'wb') as f:
+            FECExporter().export_batch_to_stream(invoice_data_list, f, "ACH")  # Default journal code
         
         return fec_path
\ No newline at end of file
@@ -6,13 +6,53 @@ Ciel accounting software used by French experts-comptables.
 """
 
 import io
+import re
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, BinaryIO
 from decimal import Decimal
 
 from schemas.invoice import InvoiceData, FrenchBusinessInfo
 
 
+# Blank fixed-width fields, built once instead of once per line
+_PAD8_EMPTY = ' ' * 8
+_PAD10_EMPTY = ' ' * 10
+
+# Everything str.isalnum() rejects: \W plus the underscore
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+# Free-text fields keep each XIMPORT record on one line and its columns in place
+_CONTROL_TO_SPACE = str.maketrans('\r\n\t', '   ')
+
+# Size of the chunks written by stream_export_batch
+_STREAM_BUFFER_SIZE = 64 * 1024
+
+# Expense account keywords, matched as substrings of the lowercased description
+_SERVICE_WORDS = ('service', 'prestation', 'consultation')
+_EQUIPMENT_WORDS = ('matériel', 'équipement')
+_SUPPLY_WORDS = ('fourniture', 'matière')
+
+_TVA_ACCOUNTS = {
+    20.0: '445662',  # TVA déductible 20%
+    10.0: '445661',  # TVA déductible 10%
+    5.5: '445663',   # TVA déductible 5.5%
+    2.1: '445664',   # TVA déductible 2.1%
+    0.0: '445660'    # TVA déductible 0%
+}
+
+
+@dataclass(slots=True)
+class _InvoiceCtx:
+    """Per-invoice fields shared by every XIMPORT line, already padded"""
+    date_str: str
+    due_str: str
+    piece: str
+    description: str
+    vendor_code: str
+    supplier_account: str
+
+
 class CielExporter:
     """Export invoice data to Ciel XIMPORT format"""
     
@@ -30,25 +70,7 @@ class CielExporter:
         Returns:
             XIMPORT formatted string
         """
-        lines = []
-        
-        # XIMPORT format uses fixed-width fields
-        # Each line represents an accounting entry
-        
-        # Invoice header entry
-        header_entry = self._format_invoice_header(invoice)
-        lines.append(header_entry)
-        
-        # Vendor entry (if new vendor)
-        if invoice.vendor and self._is_new_vendor(invoice.vendor):
-            vendor_entries = self._format_vendor_entries(invoice.vendor)
-            lines.extend(vendor_entries)
-        
-        # Accounting entries for the invoice
-        accounting_entries = self._format_accounting_entries(invoice)
-        lines.extend(accounting_entries)
-        
-        return '\\n'.join(lines)
+        return '\n'.join(self._iter_invoice_lines(invoice))
     
     def export_batch(self, invoices: List[InvoiceData]) -> str:
         """
@@ -60,24 +82,104 @@ class CielExporter:
         Returns:
             XIMPORT formatted string for all invoices
         """
-        all_lines = []
+        return '\n'.join(self._iter_batch_lines(invoices))
+    
+    def iter_export_batch(self, invoices: List[InvoiceData]) -> Iterator[str]:
+        """
+        Export multiple invoices to Ciel XIMPORT format one line at a time
+        
+        Keeps memory flat for very large batches. The concatenated lines are
+        identical to export_batch.
+        
+        Args:
+            invoices: List of invoice data to export
+            
+        Yields:
+            XIMPORT lines, each but the last terminated by a newline
+        """
+        lines = self._iter_batch_lines(invoices)
+        
+        # The batch header always comes first; hold each line back until the next one arrives
+        previous = next(lines)
+        for line in lines:
+            yield previous + '\n'
+            previous = line
+        
+        yield previous
+    
+    def stream_export_batch(self, invoices: List[InvoiceData], fileobj: BinaryIO) -> None:
+        """
+        Write a Ciel XIMPORT batch export to a binary file object
+        
+        Lines are encoded and written in 64 KiB chunks rather than one
+        write per line or one write for the whole export.
+        
+        Args:
+            invoices: List of invoice data to export
+            fileobj: Binary file object to write the export to
+        """
+        chunk = []
+        pending = 0
+        
+        for line in self.iter_export_batch(invoices):
+            chunk.append(line)
+            pending += len(line)
+            if pending >= _STREAM_BUFFER_SIZE:
+                fileobj.write(''.join(chunk).encode('utf-8'))
+                chunk.clear()
+                pending = 0
+        
+        if chunk:
+            fileobj.write(''.join(chunk).encode('utf-8'))
+    
+    def _iter_batch_lines(self, invoices: List[InvoiceData]) -> Iterator[str]:
+        """Yield the batch header, every invoice's lines, then the control totals"""
         
         # XIMPORT batch header
-        batch_header = self._format_batch_header(len(invoices))
-        all_lines.append(batch_header)
+        yield self._format_batch_header(len(invoices))
         
         # Export each invoice
         for invoice in invoices:
-            invoice_lines = self.export_invoice(invoice).split('\\n')
-            all_lines.extend(invoice_lines)
+            yield from self._iter_invoice_lines(invoice)
         
         # Batch control totals
-        batch_footer = self._format_batch_footer(invoices)
-        all_lines.append(batch_footer)
+        yield self._format_batch_footer(invoices)
+    
+    def _iter_invoice_lines(self, invoice: InvoiceData) -> Iterator[str]:
+        """Yield the XIMPORT lines for a single invoice"""
+        
+        # XIMPORT format uses fixed-width fields
+        # Each line represents an accounting entry
+        ctx = self._build_invoice_ctx(invoice)
+        
+        # Invoice header entry
+        yield self._format_invoice_header(invoice, ctx)
+        
+        # Vendor entry (if new vendor)
+        if invoice.vendor and self._is_new_vendor(invoice.vendor):
+            yield from self._format_vendor_entries(invoice.vendor, ctx)
+        
+        # Accounting entries for the invoice
+        yield from self._format_accounting_entries(invoice, ctx)
+    
+    def _build_invoice_ctx(self, invoice: InvoiceData) -> _InvoiceCtx:
+        """Compute the strings repeated across an invoice's lines once"""
+        
+        date_str = self._format_date_ciel(invoice.date)
+        due_str = self._format_date_ciel(invoice.due_date) if invoice.due_date else date_str
+        description = f"Facture {invoice.invoice_number}" if invoice.invoice_number else "Facture"
+        vendor_code = self._generate_vendor_code(invoice.vendor) if invoice.vendor else ''
         
-        return '\\n'.join(all_lines)
+        return _InvoiceCtx(
+            date_str=date_str,
+            due_str=due_str,
+            piece=(invoice.invoice_number or '')[:20].ljust(20),
+            description=description[:25].ljust(25),
+            vendor_code=vendor_code[:8].ljust(8),
+            supplier_account=self._get_supplier_account(invoice.vendor)[:8].ljust(8)
+        )
     
-    def _format_invoice_header(self, invoice: InvoiceData) -> str:
+    def _format_invoice_header(self, invoice: InvoiceData, ctx: _InvoiceCtx) -> str:
         """Format invoice header for Ciel XIMPORT"""
         
         # XIMPORT line format: Type(1) + Journal(2) + Date(8) + Piece(20) + Libelle(25) + etc.
@@ -90,37 +192,30 @@ class CielExporter:
         fields.append('AC')
         
         # Date (8 chars): DDMMYYYY
-        fields.append(self._format_date_ciel(invoice.date))
+        fields.append(ctx.date_str)
         
         # Piece number (20 chars)
-        fields.append(self._pad_field(invoice.invoice_number or '', 20))
+        fields.append(ctx.piece)
         
         # Description (25 chars)
-        description = f"Facture {invoice.invoice_number}" if invoice.invoice_number else "Facture"
-        fields.append(self._pad_field(description, 25))
+        fields.append(ctx.description)
         
         # Additional header information
-        fields.append(self._pad_field('', 10))  # Reserved
+        fields.append(_PAD10_EMPTY)  # Reserved
         
         return ''.join(fields)
     
-    def _format_vendor_entries(self, vendor: FrenchBusinessInfo) -> List[str]:
+    def _format_vendor_entries(self, vendor: FrenchBusinessInfo, ctx: _InvoiceCtx) -> Iterator[str]:
         """Format vendor creation entries for Ciel"""
         
-        entries = []
-        
         # Main vendor entry
-        vendor_entry = self._format_vendor_main_entry(vendor)
-        entries.append(vendor_entry)
+        yield self._format_vendor_main_entry(vendor, ctx)
         
         # Additional vendor information entries
         if vendor.address:
-            address_entry = self._format_vendor_address_entry(vendor)
-            entries.append(address_entry)
-        
-        return entries
+            yield self._format_vendor_address_entry(vendor, ctx)
     
-    def _format_vendor_main_entry(self, vendor: FrenchBusinessInfo) -> str:
+    def _format_vendor_main_entry(self, vendor: FrenchBusinessInfo, ctx: _InvoiceCtx) -> str:
         """Format main vendor entry"""
         
         fields = []
@@ -129,30 +224,29 @@ class CielExporter:
         fields.append('F')
         
         # Vendor code (8 chars) - based on SIREN if available
-        vendor_code = self._generate_vendor_code(vendor)
-        fields.append(self._pad_field(vendor_code, 8))
+        fields.append(ctx.vendor_code)
         
         # Vendor name (35 chars)
-        fields.append(self._pad_field(vendor.name, 35))
+        fields.append(self._truncate_field(vendor.name, 35).ljust(35))
         
         # SIREN (9 chars)
-        fields.append(self._pad_field(vendor.siren_number or '', 9))
+        fields.append((vendor.siren_number or '')[:9].ljust(9))
         
         # SIRET (14 chars)
-        fields.append(self._pad_field(vendor.siret_number or '', 14))
+        fields.append((vendor.siret_number or '')[:14].ljust(14))
         
         # TVA number (13 chars)
-        fields.append(self._pad_field(vendor.tva_number or '', 13))
+        fields.append((vendor.tva_number or '')[:13].ljust(13))
         
         # NAF code (5 chars)
-        fields.append(self._pad_field(vendor.naf_code or '', 5))
+        fields.append((vendor.naf_code or '')[:5].ljust(5))
         
         # Legal form (10 chars)
-        fields.append(self._pad_field(vendor.legal_form or '', 10))
+        fields.append((vendor.legal_form or '')[:10].ljust(10))
         
         return ''.join(fields)
     
-    def _format_vendor_address_entry(self, vendor: FrenchBusinessInfo) -> str:
+    def _format_vendor_address_entry(self, vendor: FrenchBusinessInfo, ctx: _InvoiceCtx) -> str:
         """Format vendor address entry"""
         
         fields = []
@@ -161,51 +255,43 @@ class CielExporter:
         fields.append('A')
         
         # Vendor code (8 chars)
-        vendor_code = self._generate_vendor_code(vendor)
-        fields.append(self._pad_field(vendor_code, 8))
+        fields.append(ctx.vendor_code)
         
         # Address (35 chars)
-        fields.append(self._pad_field(vendor.address or '', 35))
+        fields.append(self._truncate_field(vendor.address, 35).ljust(35))
         
         # Postal code (5 chars)
-        fields.append(self._pad_field(vendor.postal_code or '', 5))
+        fields.append((vendor.postal_code or '')[:5].ljust(5))
         
         # City (25 chars)
-        fields.append(self._pad_field(vendor.city or '', 25))
+        fields.append(self._truncate_field(vendor.city, 25).ljust(25))
         
         # Country (15 chars)
-        fields.append(self._pad_field(vendor.country or 'France', 15))
+        fields.append((vendor.country or 'France')[:15].ljust(15))
         
         # Phone (15 chars)
-        fields.append(self._pad_field(vendor.phone or '', 15))
+        fields.append((vendor.phone or '')[:15].ljust(15))
         
         # Email (50 chars)
-        fields.append(self._pad_field(vendor.email or '', 50))
+        fields.append((vendor.email or '')[:50].ljust(50))
         
         return ''.join(fields)
     
-    def _format_accounting_entries(self, invoice: InvoiceData) -> List[str]:
+    def _format_accounting_entries(self, invoice: InvoiceData, ctx: _InvoiceCtx) -> Iterator[str]:
         """Format accounting entries for the invoice"""
         
-        entries = []
-        
         # Supplier credit entry
-        supplier_entry = self._format_supplier_credit_entry(invoice)
-        entries.append(supplier_entry)
+        yield self._format_supplier_credit_entry(invoice, ctx)
         
         # Line items debit entries
         for i, item in enumerate(invoice.line_items):
-            item_entry = self._format_line_item_entry(item, invoice, i + 1)
-            entries.append(item_entry)
+            yield self._format_line_item_entry(item, ctx, i + 1)
         
         # TVA debit entries
         for tva_item in invoice.tva_breakdown:
-            tva_entry = self._format_tva_debit_entry(tva_item, invoice)
-            entries.append(tva_entry)
-        
-        return entries
+            yield self._format_tva_debit_entry(tva_item, ctx)
     
-    def _format_supplier_credit_entry(self, invoice: InvoiceData) -> str:
+    def _format_supplier_credit_entry(self, invoice: InvoiceData, ctx: _InvoiceCtx) -> str:
         """Format supplier account credit entry"""
         
         fields = []
@@ -217,19 +303,16 @@ class CielExporter:
         fields.append('AC')
         
         # Date (8 chars)
-        fields.append(self._format_date_ciel(invoice.date))
+        fields.append(ctx.date_str)
         
         # Account (8 chars) - Supplier account
-        supplier_account = self._get_supplier_account(invoice.vendor)
-        fields.append(self._pad_field(supplier_account, 8))
+        fields.append(ctx.supplier_account)
         
         # Auxiliary account (8 chars) - Vendor code
-        vendor_code = self._generate_vendor_code(invoice.vendor) if invoice.vendor else ''
-        fields.append(self._pad_field(vendor_code, 8))
+        fields.append(ctx.vendor_code)
         
         # Description (25 chars)
-        description = f"Facture {invoice.invoice_number}" if invoice.invoice_number else "Facture"
-        fields.append(self._pad_field(description, 25))
+        fields.append(ctx.description)
         
         # Debit amount (15 chars) - 0 for credit entry
         fields.append(self._format_amount_ciel(0))
@@ -239,15 +322,14 @@ class CielExporter:
         fields.append(self._format_amount_ciel(total_amount))
         
         # Piece number (20 chars)
-        fields.append(self._pad_field(invoice.invoice_number or '', 20))
+        fields.append(ctx.piece)
         
         # Due date (8 chars)
-        due_date = invoice.due_date if invoice.due_date else invoice.date
-        fields.append(self._format_date_ciel(due_date))
+        fields.append(ctx.due_str)
         
         return ''.join(fields)
     
-    def _format_line_item_entry(self, item, invoice: InvoiceData, line_number: int) -> str:
+    def _format_line_item_entry(self, item, ctx: _InvoiceCtx, line_number: int) -> str:
         """Format line item debit entry"""
         
         fields = []
@@ -259,18 +341,18 @@ class CielExporter:
         fields.append('AC')
         
         # Date (8 chars)
-        fields.append(self._format_date_ciel(invoice.date))
+        fields.append(ctx.date_str)
         
         # Account (8 chars) - Expense account based on item type
         account = self._determine_expense_account(item.description)
-        fields.append(self._pad_field(account, 8))
+        fields.append(account[:8].ljust(8))
         
         # Auxiliary account (8 chars) - Empty for expense accounts
-        fields.append(self._pad_field('', 8))
+        fields.append(_PAD8_EMPTY)
         
         # Description (25 chars)
         description = self._truncate_field(item.description, 25)
-        fields.append(self._pad_field(description, 25))
+        fields.append(description[:25].ljust(25))
         
         # Debit amount (15 chars) - Item total HT
         fields.append(self._format_amount_ciel(item.total))
@@ -279,10 +361,10 @@ class CielExporter:
         fields.append(self._format_amount_ciel(0))
         
         # Piece number (20 chars)
-        fields.append(self._pad_field(invoice.invoice_number or '', 20))
+        fields.append(ctx.piece)
         
         # Additional fields
-        fields.append(self._pad_field('', 8))  # Date échéance (empty for expense)
+        fields.append(_PAD8_EMPTY)  # Date échéance (empty for expense)
         
         # Quantity and unit price
         fields.append(self._format_quantity_ciel(item.quantity))
@@ -290,7 +372,7 @@ class CielExporter:
         
         return ''.join(fields)
     
-    def _format_tva_debit_entry(self, tva_item, invoice: InvoiceData) -> str:
+    def _format_tva_debit_entry(self, tva_item, ctx: _InvoiceCtx) -> str:
         """Format TVA debit entry"""
         
         fields = []
@@ -302,18 +384,18 @@ class CielExporter:
         fields.append('AC')
         
         # Date (8 chars)
-        fields.append(self._format_date_ciel(invoice.date))
+        fields.append(ctx.date_str)
         
         # Account (8 chars) - TVA account
         tva_account = self._get_tva_account_ciel(tva_item.rate)
-        fields.append(self._pad_field(tva_account, 8))
+        fields.append(tva_account[:8].ljust(8))
         
         # Auxiliary account (8 chars) - Empty
-        fields.append(self._pad_field('', 8))
+        fields.append(_PAD8_EMPTY)
         
         # Description (25 chars)
         description = f"TVA {tva_item.rate}%"
-        fields.append(self._pad_field(description, 25))
+        fields.append(description[:25].ljust(25))
         
         # Debit amount (15 chars) - TVA amount
         fields.append(self._format_amount_ciel(tva_item.tva_amount))
@@ -322,10 +404,10 @@ class CielExporter:
         fields.append(self._format_amount_ciel(0))
         
         # Piece number (20 chars)
-        fields.append(self._pad_field(invoice.invoice_number or '', 20))
+        fields.append(ctx.piece)
         
         # Additional fields
-        fields.append(self._pad_field('', 8))  # Date échéance
+        fields.append(_PAD8_EMPTY)  # Date échéance
         
         return ''.join(fields)
     
@@ -338,16 +420,16 @@ class CielExporter:
         fields.append('H')
         
         # Version
-        fields.append(self._pad_field('CIEL_V3', 10))
+        fields.append('CIEL_V3'.ljust(10))
         
         # Creation date
         fields.append(self._format_date_ciel(datetime.now().date()))
         
         # Number of entries
-        fields.append(self._pad_field(str(count), 10))
+        fields.append(str(count)[:10].ljust(10))
         
         # Origin
-        fields.append(self._pad_field('INVOICE_AI', 20))
+        fields.append('INVOICE_AI'.ljust(20))
         
         return ''.join(fields)
     
@@ -366,7 +448,7 @@ class CielExporter:
         fields.append('T')
         
         # Total entries
-        fields.append(self._pad_field(str(len(invoices)), 10))
+        fields.append(str(len(invoices))[:10].ljust(10))
         
         # Total debit
         fields.append(self._format_amount_ciel(total_debit))
@@ -417,21 +499,16 @@ class CielExporter:
         """Format quantity for Ciel (10 chars)"""
         
         if quantity is None:
-            return ' ' * 10
+            return _PAD10_EMPTY
         
         # Format with 3 decimal places
         qty_str = f"{float(quantity):.3f}"
         return qty_str.rjust(10)
     
-    def _pad_field(self, value: str, width: int) -> str:
-        """Pad field to specified width"""
-        
-        return str(value)[:width].ljust(width)
-    
     def _truncate_field(self, value: str, max_length: int) -> str:
-        """Truncate field to maximum length"""
+        """Truncate field to maximum length, with line breaks and tabs as spaces"""
         
-        return str(value)[:max_length] if value else ''
+        return str(value)[:max_length].translate(_CONTROL_TO_SPACE) if value else ''
     
     def _generate_vendor_code(self, vendor: Optional[FrenchBusinessInfo]) -> str:
         """Generate vendor code from SIREN or name"""
@@ -443,7 +520,7 @@ class CielExporter:
             return f"F{vendor.siren_number[-6:]}"
         elif vendor.name:
             # Use first 8 chars of name, alphanumeric only
-            name_clean = ''.join(c for c in vendor.name if c.isalnum())[:8]
+            name_clean = _NON_ALNUM.sub('', vendor.name)[:8]
             return name_clean.upper().ljust(8)
         else:
             return 'FOUR001'
@@ -459,11 +536,11 @@ class CielExporter:
         # Simplified mapping - in practice, you'd want more sophisticated logic
         description_lower = description.lower() if description else ''
         
-        if any(word in description_lower for word in ['service', 'prestation', 'consultation']):
+        if any(word in description_lower for word in _SERVICE_WORDS):
             return '606000'  # Services
-        elif any(word in description_lower for word in ['matériel', 'équipement']):
+        elif any(word in description_lower for word in _EQUIPMENT_WORDS):
             return '606100'  # Equipment
-        elif any(word in description_lower for word in ['fourniture', 'matière']):
+        elif any(word in description_lower for word in _SUPPLY_WORDS):
             return '607000'  # Supplies
         else:
             return '607000'  # Default
@@ -471,15 +548,7 @@ class CielExporter:
     def _get_tva_account_ciel(self, rate: float) -> str:
         """Get TVA account for Ciel"""
         
-        tva_accounts = {
-            20.0: '445662',  # TVA déductible 20%
-            10.0: '445661',  # TVA déductible 10%
-            5.5: '445663',   # TVA déductible 5.5%
-            2.1: '445664',   # TVA déductible 2.1%
-            0.0: '445660'    # TVA déductible 0%
-        }
-        
-        return tva_accounts.get(rate, '445662')
+        return _TVA_ACCOUNTS.get(rate, '445662')
     
     def _is_new_vendor(self, vendor: FrenchBusinessInfo) -> bool:
         """Check if vendor is new (simplified - in practice, check against existing vendors)"""
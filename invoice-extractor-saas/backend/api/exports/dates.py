@@ -0,0 +1,42 @@
+"""
+Date parsing shared by the accounting exporters
+
+Invoice dates extracted from documents reach the exporters either as date
+objects or as ISO (YYYY-MM-DD) or French (DD/MM/YYYY) strings. Each exporter
+formats the parsed date in its own layout.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=1024)
+def parse_date_string(date_input: str) -> Optional[date]:
+    """Parse an ISO or French date string, or return None if neither matches"""
+
+    if len(date_input) == 10:
+        # Zero-padded YYYY-MM-DD or DD/MM/YYYY: slice the fields directly
+        if date_input[4] == '-' == date_input[7]:
+            year, month, day = date_input[0:4], date_input[5:7], date_input[8:10]
+        elif date_input[2] == '/' == date_input[5]:
+            year, month, day = date_input[6:10], date_input[3:5], date_input[0:2]
+        else:
+            year = month = day = ''
+
+        digits = year + month + day
+        if digits.isascii() and digits.isdigit():
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                # Impossible day or month
+                return None
+
+    # Unpadded variants such as 2024-3-5 or 5/3/2024
+    for date_format in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(date_input, date_format).date()
+        except ValueError:
+            continue
+
+    return None
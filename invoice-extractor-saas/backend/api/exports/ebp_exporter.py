@@ -3,23 +3,133 @@ EBP Accounting Software Export Module
 
 Exports invoice data to EBP ASCII format for seamless integration with 
 EBP accounting software used by French experts-comptables.
+
+Files are encoded as Windows-1252, the code page EBP imports; characters
+outside it (arrows, emoji, CJK, ...) are written as '?'.
 """
 
 import io
+import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple
+from decimal import Decimal, ROUND_HALF_UP
 
 from schemas.invoice import InvoiceData, FrenchBusinessInfo
+from api.exports.dates import parse_date_string
+
+
+# EBP field definitions (1-based position and width)
+_FIELD_SPECS = {
+    'type': (1, 1),
+    'journal': (2, 3),
+    'date': (5, 8),
+    'compte_general': (13, 8),
+    'compte_auxiliaire': (21, 8),
+    'libelle': (29, 30),
+    'debit': (59, 15),
+    'credit': (74, 15),
+    'tva_code': (89, 3),
+    'piece': (92, 20),
+    'echeance': (112, 8),
+    'siren': (120, 9),
+    'siret': (129, 14),
+    'tva_number': (143, 13),
+    'quantite': (156, 10),
+    'unite': (166, 5),
+    'prix_unitaire': (171, 15),
+    'taux_tva': (186, 5),
+    'base_tva': (191, 15),
+    'version': (2, 10),
+    'date_creation': (12, 8),
+    'nb_ecritures': (20, 10),
+    'origine': (30, 20),
+    'format': (50, 20)
+}
+
+# Same specs with 0-based start positions, as used to index the line buffer
+_FIELD_POSITIONS = {name: (start - 1, width) for name, (start, width) in _FIELD_SPECS.items()}
+
+
+def _layout(*field_names: str) -> Tuple[Tuple[int, int], ...]:
+    """Resolve an ordered list of field names to (0-based start, width) pairs"""
+    return tuple(_FIELD_POSITIONS[name] for name in field_names)
+
+
+# Field order of each EBP line type, matching the values tuples built below
+_VENDOR_LAYOUT = _layout(
+    'type', 'journal', 'date', 'compte_general', 'compte_auxiliaire', 'libelle',
+    'debit', 'credit', 'tva_code', 'piece', 'echeance', 'siren', 'siret',
+    'tva_number'
+)
+
+_CUSTOMER_LAYOUT = _layout(
+    'type', 'journal', 'date', 'compte_general', 'compte_auxiliaire', 'libelle',
+    'debit', 'credit', 'tva_code', 'piece', 'echeance', 'siren', 'siret'
+)
+
+_LINE_ITEM_LAYOUT = _layout(
+    'type', 'journal', 'date', 'compte_general', 'compte_auxiliaire', 'libelle',
+    'debit', 'credit', 'tva_code', 'piece', 'quantite', 'unite', 'prix_unitaire'
+)
+
+_TVA_LAYOUT = _layout(
+    'type', 'journal', 'date', 'compte_general', 'compte_auxiliaire', 'libelle',
+    'debit', 'credit', 'tva_code', 'piece', 'taux_tva', 'base_tva'
+)
+
+_HEADER_LAYOUT = _layout(
+    'type', 'version', 'date_creation', 'nb_ecritures', 'origine', 'format'
+)
+
+# Encoding of the packed lines; EBP reads these files as Windows-1252, one byte per char
+_ENCODING = 'cp1252'
+
+# Separator written before every EBP line that follows another one
+_LINE_END = b'\n'
+
+# Line breaks and tabs in free text would split or shift a fixed-width record
+_CONTROL_TO_SPACE = bytes.maketrans(b'\r\n\t', b'   ')
+
+# Zero amount, the unused debit or credit side of most lines
+_ZERO_AMOUNT_EBP = f"{0:+013d}".rjust(15)
+
+# Amounts below this many cents fit the 13-char signed field exactly
+_MAX_FIXED_WIDTH_CENTS = 10 ** 12
+
+# Expense account keyword patterns, checked in priority order
+_ACCOUNT_PATTERNS = (
+    (re.compile('service|prestation|consultation', re.IGNORECASE), '606000'),  # Services
+    (re.compile('matériel|équipement|machine', re.IGNORECASE), '606100'),  # Equipment
+    (re.compile('fourniture|matière|produit', re.IGNORECASE), '607000')  # Supplies
+)
+
+_TVA_CODES = {
+    20.0: 'T20',
+    10.0: 'T10',
+    5.5: 'T55',
+    2.1: 'T21',
+    0.0: 'T00'
+}
+
+_TVA_ACCOUNTS = {
+    20.0: '445662',  # TVA déductible 20%
+    10.0: '445661',  # TVA déductible 10%
+    5.5: '445663',   # TVA déductible 5.5%
+    2.1: '445664',   # TVA déductible 2.1%
+    0.0: '445660'    # TVA déductible 0%
+}
 
 
 class EBPExporter:
     """Export invoice data to EBP ASCII format"""
     
+    __slots__ = ('format_name', 'file_extension', 'line_length', '_blank_line')
+    
     def __init__(self):
         self.format_name = "EBP ASCII"
         self.file_extension = ".txt"
         self.line_length = 256  # Fixed line length for EBP format
+        self._blank_line = b' ' * self.line_length
     
     def export_invoice(self, invoice: InvoiceData) -> str:
         """
@@ -31,32 +141,22 @@ class EBPExporter:
         Returns:
             EBP ASCII formatted string
         """
-        lines = []
-        
-        # Format: Fixed-width fields, space-padded
-        # Structure: Type|Journal|Date|CompteGeneral|CompteAuxiliaire|Libelle|Debit|Credit|...
-        
-        # Vendor entry (credit)
-        if invoice.vendor:
-            vendor_line = self._format_vendor_entry(invoice)
-            lines.append(vendor_line)
-        
-        # Customer entry (debit) - if different from vendor
-        if invoice.customer and invoice.customer != invoice.vendor:
-            customer_line = self._format_customer_entry(invoice)
-            lines.append(customer_line)
-        
-        # Line items entries
-        for i, item in enumerate(invoice.line_items):
-            item_line = self._format_line_item_entry(item, invoice, i + 1)
-            lines.append(item_line)
+        return self.export_invoice_bytes(invoice).decode(_ENCODING)
+    
+    def export_invoice_bytes(self, invoice: InvoiceData) -> bytes:
+        """
+        Export a single invoice to EBP ASCII format as Windows-1252 bytes
         
-        # TVA entries
-        for tva_item in invoice.tva_breakdown:
-            tva_line = self._format_tva_entry(tva_item, invoice)
-            lines.append(tva_line)
+        Args:
+            invoice: Invoice data to export
+            
+        Returns:
+            EBP ASCII encoded content
+        """
+        out = io.BytesIO()
+        self._write_invoice(invoice, out)
         
-        return '\\n'.join(lines)
+        return out.getvalue()[len(_LINE_END):]
     
     def export_batch(self, invoices: List[InvoiceData]) -> str:
         """
@@ -68,173 +168,202 @@ class EBPExporter:
         Returns:
             EBP ASCII formatted string for all invoices
         """
-        all_lines = []
+        return self.export_batch_bytes(invoices).decode(_ENCODING)
+    
+    def export_batch_bytes(self, invoices: List[InvoiceData]) -> bytes:
+        """
+        Export multiple invoices to EBP ASCII format as Windows-1252 bytes
+        
+        Lines are packed as bytes throughout, so file writers can use this
+        directly and skip decoding the export into a str.
+        
+        Args:
+            invoices: List of invoice data to export
+            
+        Returns:
+            EBP ASCII encoded content for all invoices
+        """
+        out = io.BytesIO()
         
-        # EBP batch header
-        header = self._format_batch_header(len(invoices))
-        all_lines.append(header)
+        # EBP batch header; every later line is written with its leading
+        # separator, so the buffer is final as-is and getvalue() needs no
+        # trimming copy of the whole export
+        out.write(self._format_batch_header(len(invoices)))
         
         # Export each invoice
         for invoice in invoices:
-            invoice_lines = self.export_invoice(invoice).split('\\n')
-            all_lines.extend(invoice_lines)
+            self._write_invoice(invoice, out)
+        
+        return out.getvalue()
+    
+    def _write_invoice(self, invoice: InvoiceData, out: io.BytesIO) -> None:
+        """Write the EBP lines of one invoice to out, each preceded by _LINE_END"""
+        
+        # Format: Fixed-width fields, space-padded
+        # Structure: Type|Journal|Date|CompteGeneral|CompteAuxiliaire|Libelle|Debit|Credit|...
         
-        return '\\n'.join(all_lines)
+        # Dates are identical on every line of the invoice, format them once
+        inv_date = self._format_date_ebp(invoice.date)
+        due_date = self._format_date_ebp(invoice.due_date) if invoice.due_date else inv_date
+        
+        # Single pass over the TVA breakdown: format its lines and find the
+        # rate with the highest amount, which the vendor line needs
+        tva_lines = []
+        main_tva = None
+        for tva_item in invoice.tva_breakdown:
+            tva_lines.append(self._format_tva_entry(tva_item, invoice, inv_date))
+            if main_tva is None or tva_item.tva_amount > main_tva.tva_amount:
+                main_tva = tva_item
+        main_tva_code = self._get_tva_code(main_tva.rate) if main_tva else 'T20'  # Default to 20%
+        
+        # Vendor entry (credit)
+        if invoice.vendor:
+            out.write(_LINE_END)
+            out.write(self._format_vendor_entry(invoice, inv_date, due_date, main_tva_code))
+        
+        # Customer entry (debit) - if different from vendor
+        if invoice.customer and invoice.customer != invoice.vendor:
+            out.write(_LINE_END)
+            out.write(self._format_customer_entry(invoice, inv_date, due_date))
+        
+        # Line items entries
+        for i, item in enumerate(invoice.line_items):
+            out.write(_LINE_END)
+            out.write(self._format_line_item_entry(item, invoice, i + 1, inv_date))
+        
+        # TVA entries
+        for tva_line in tva_lines:
+            out.write(_LINE_END)
+            out.write(tva_line)
     
-    def _format_vendor_entry(self, invoice: InvoiceData) -> str:
+    def _format_vendor_entry(self, invoice: InvoiceData, inv_date: str, due_date: str, main_tva_code: str) -> bytes:
         """Format vendor entry for EBP"""
         
-        # EBP fixed-width format
-        fields = {
-            'type': 'V',  # Vendor entry
-            'journal': 'ACH',  # Purchase journal
-            'date': self._format_date_ebp(invoice.date),
-            'compte_general': '401000',  # General account for suppliers
-            'compte_auxiliaire': self._get_vendor_account(invoice.vendor),
-            'libelle': self._truncate(f"Facture {invoice.invoice_number}", 30),
-            'debit': self._format_amount_ebp(0),
-            'credit': self._format_amount_ebp(invoice.total_ttc or invoice.total or 0),
-            'tva_code': self._get_main_tva_code(invoice),
-            'piece': invoice.invoice_number or '',
-            'echeance': self._format_date_ebp(invoice.due_date) if invoice.due_date else self._format_date_ebp(invoice.date),
-            'siren': invoice.vendor.siren_number if invoice.vendor else '',
-            'siret': invoice.vendor.siret_number if invoice.vendor else '',
-            'tva_number': invoice.vendor.tva_number if invoice.vendor else ''
-        }
+        vendor = invoice.vendor
+        invoice_number = invoice.invoice_number
+        total = invoice.total_ttc or invoice.total or 0
         
-        return self._format_fixed_line(fields)
+        # EBP fixed-width format
+        values = (
+            'V',  # type - Vendor entry
+            'ACH',  # journal - Purchase journal
+            inv_date,  # date
+            '401000',  # compte_general - General account for suppliers
+            self._get_vendor_account(vendor),  # compte_auxiliaire
+            f"Facture {invoice_number}"[:30],  # libelle
+            self._format_amount_ebp(0),  # debit
+            self._format_amount_ebp(total),  # credit
+            main_tva_code,  # tva_code
+            invoice_number or '',  # piece
+            due_date,  # echeance
+            vendor.siren_number if vendor else '',  # siren
+            vendor.siret_number if vendor else '',  # siret
+            vendor.tva_number if vendor else ''  # tva_number
+        )
+        
+        return self._format_fixed_line(_VENDOR_LAYOUT, values)
     
-    def _format_customer_entry(self, invoice: InvoiceData) -> str:
+    def _format_customer_entry(self, invoice: InvoiceData, inv_date: str, due_date: str) -> bytes:
         """Format customer entry for EBP (if needed for some transaction types)"""
         
-        fields = {
-            'type': 'C',  # Customer entry
-            'journal': 'VTE',  # Sales journal
-            'date': self._format_date_ebp(invoice.date),
-            'compte_general': '411000',  # General account for customers
-            'compte_auxiliaire': self._get_customer_account(invoice.customer),
-            'libelle': self._truncate(f"Facture {invoice.invoice_number}", 30),
-            'debit': self._format_amount_ebp(invoice.total_ttc or invoice.total or 0),
-            'credit': self._format_amount_ebp(0),
-            'tva_code': '',
-            'piece': invoice.invoice_number or '',
-            'echeance': self._format_date_ebp(invoice.due_date) if invoice.due_date else self._format_date_ebp(invoice.date),
-            'siren': invoice.customer.siren_number if invoice.customer else '',
-            'siret': invoice.customer.siret_number if invoice.customer else ''
-        }
-        
-        return self._format_fixed_line(fields)
+        customer = invoice.customer
+        invoice_number = invoice.invoice_number
+        total = invoice.total_ttc or invoice.total or 0
+        
+        values = (
+            'C',  # type - Customer entry
+            'VTE',  # journal - Sales journal
+            inv_date,  # date
+            '411000',  # compte_general - General account for customers
+            self._get_customer_account(customer),  # compte_auxiliaire
+            f"Facture {invoice_number}"[:30],  # libelle
+            self._format_amount_ebp(total),  # debit
+            self._format_amount_ebp(0),  # credit
+            '',  # tva_code
+            invoice_number or '',  # piece
+            due_date,  # echeance
+            customer.siren_number if customer else '',  # siren
+            customer.siret_number if customer else ''  # siret
+        )
+        
+        return self._format_fixed_line(_CUSTOMER_LAYOUT, values)
     
-    def _format_line_item_entry(self, item, invoice: InvoiceData, line_number: int) -> str:
+    def _format_line_item_entry(self, item, invoice: InvoiceData, line_number: int, inv_date: str) -> bytes:
         """Format line item entry for EBP"""
         
         # Determine account based on item description (simplified)
         account_code = self._determine_account_code(item.description)
         
-        fields = {
-            'type': 'L',  # Line item
-            'journal': 'ACH',
-            'date': self._format_date_ebp(invoice.date),
-            'compte_general': account_code,
-            'compte_auxiliaire': '',
-            'libelle': self._truncate(item.description, 30),
-            'debit': self._format_amount_ebp(item.total),
-            'credit': self._format_amount_ebp(0),
-            'tva_code': self._get_tva_code(item.tva_rate or 20.0),
-            'piece': invoice.invoice_number or '',
-            'quantite': str(item.quantity),
-            'unite': item.unit or '',
-            'prix_unitaire': self._format_amount_ebp(item.unit_price)
-        }
-        
-        return self._format_fixed_line(fields)
+        values = (
+            'L',  # type - Line item
+            'ACH',  # journal
+            inv_date,  # date
+            account_code,  # compte_general
+            '',  # compte_auxiliaire
+            (item.description or '')[:30],  # libelle
+            self._format_amount_ebp(item.total),  # debit
+            self._format_amount_ebp(0),  # credit
+            self._get_tva_code(item.tva_rate or 20.0),  # tva_code
+            invoice.invoice_number or '',  # piece
+            str(item.quantity),  # quantite
+            item.unit or '',  # unite
+            self._format_amount_ebp(item.unit_price)  # prix_unitaire
+        )
+        
+        return self._format_fixed_line(_LINE_ITEM_LAYOUT, values)
     
-    def _format_tva_entry(self, tva_item, invoice: InvoiceData) -> str:
+    def _format_tva_entry(self, tva_item, invoice: InvoiceData, inv_date: str) -> bytes:
         """Format TVA entry for EBP"""
         
         tva_account = self._get_tva_account(tva_item.rate)
         
-        fields = {
-            'type': 'T',  # TVA entry
-            'journal': 'ACH',
-            'date': self._format_date_ebp(invoice.date),
-            'compte_general': tva_account,
-            'compte_auxiliaire': '',
-            'libelle': self._truncate(f"TVA {tva_item.rate}%", 30),
-            'debit': self._format_amount_ebp(tva_item.tva_amount),
-            'credit': self._format_amount_ebp(0),
-            'tva_code': self._get_tva_code(tva_item.rate),
-            'piece': invoice.invoice_number or '',
-            'taux_tva': str(tva_item.rate),
-            'base_tva': self._format_amount_ebp(tva_item.taxable_amount)
-        }
-        
-        return self._format_fixed_line(fields)
+        values = (
+            'T',  # type - TVA entry
+            'ACH',  # journal
+            inv_date,  # date
+            tva_account,  # compte_general
+            '',  # compte_auxiliaire
+            f"TVA {tva_item.rate}%"[:30],  # libelle
+            self._format_amount_ebp(tva_item.tva_amount),  # debit
+            self._format_amount_ebp(0),  # credit
+            self._get_tva_code(tva_item.rate),  # tva_code
+            invoice.invoice_number or '',  # piece
+            str(tva_item.rate),  # taux_tva
+            self._format_amount_ebp(tva_item.taxable_amount)  # base_tva
+        )
+        
+        return self._format_fixed_line(_TVA_LAYOUT, values)
     
-    def _format_batch_header(self, count: int) -> str:
+    def _format_batch_header(self, count: int) -> bytes:
         """Format batch header for EBP"""
         
-        fields = {
-            'type': 'H',  # Header
-            'version': 'EBP_V3',
-            'date_creation': datetime.now().strftime('%d/%m/%Y'),
-            'nb_ecritures': str(count),
-            'origine': 'INVOICE_AI',
-            'format': 'ASCII_FIXE'
-        }
+        values = (
+            'H',  # type - Header
+            'EBP_V3',  # version
+            datetime.now().strftime('%d/%m/%Y'),  # date_creation
+            str(count),  # nb_ecritures
+            'INVOICE_AI',  # origine
+            'ASCII_FIXE'  # format
+        )
         
-        return self._format_fixed_line(fields)
+        return self._format_fixed_line(_HEADER_LAYOUT, values)
     
-    def _format_fixed_line(self, fields: Dict[str, str]) -> str:
-        """Format a line with fixed-width fields for EBP"""
-        
-        # EBP field definitions (position and width)
-        field_specs = {
-            'type': (1, 1),
-            'journal': (2, 3),
-            'date': (5, 8),
-            'compte_general': (13, 8),
-            'compte_auxiliaire': (21, 8),
-            'libelle': (29, 30),
-            'debit': (59, 15),
-            'credit': (74, 15),
-            'tva_code': (89, 3),
-            'piece': (92, 20),
-            'echeance': (112, 8),
-            'siren': (120, 9),
-            'siret': (129, 14),
-            'tva_number': (143, 13),
-            'quantite': (156, 10),
-            'unite': (166, 5),
-            'prix_unitaire': (171, 15),
-            'taux_tva': (186, 5),
-            'base_tva': (191, 15),
-            'version': (2, 10),
-            'date_creation': (12, 8),
-            'nb_ecritures': (20, 10),
-            'origine': (30, 20),
-            'format': (50, 20)
-        }
+    def _format_fixed_line(self, layout: Tuple[Tuple[int, int], ...], values: Tuple[Any, ...]) -> bytes:
+        """Format a line with fixed-width fields for EBP, values ordered as in layout"""
         
-        # Create line buffer
-        line = [' '] * self.line_length
+        # Initialize line with spaces
+        line = bytearray(self._blank_line)
         
         # Fill fields
-        for field_name, value in fields.items():
-            if field_name in field_specs and value:
-                start_pos, width = field_specs[field_name]
-                # Adjust for 0-based indexing
-                start_pos -= 1
-                
-                # Truncate or pad value
-                formatted_value = str(value)[:width].ljust(width)
+        for (start_pos, width), value in zip(layout, values):
+            if value:
+                width = min(width, self.line_length - start_pos)
                 
-                # Insert into line buffer
-                for i, char in enumerate(formatted_value):
-                    if start_pos + i < len(line):
-                        line[start_pos + i] = char
+                # Truncate, then copy into the line buffer in one slice write
+                formatted_value = str(value)[:width].encode(_ENCODING, 'replace')
+                line[start_pos:start_pos + len(formatted_value)] = formatted_value
         
-        return ''.join(line).rstrip()
+        return line.translate(_CONTROL_TO_SPACE).rstrip()
     
     def _format_date_ebp(self, date_input) -> str:
         """Format date for EBP (DDMMYYYY)"""
@@ -243,33 +372,34 @@ class EBPExporter:
             return datetime.now().strftime('%d%m%Y')
         
         if isinstance(date_input, str):
-            try:
-                # Try to parse ISO format
-                date_obj = datetime.strptime(date_input, '%Y-%m-%d').date()
-            except ValueError:
-                try:
-                    # Try French format
-                    date_obj = datetime.strptime(date_input, '%d/%m/%Y').date()
-                except ValueError:
-                    return datetime.now().strftime('%d%m%Y')
+            date_obj = parse_date_string(date_input)
+            if date_obj is None:
+                return datetime.now().strftime('%d%m%Y')
         else:
             date_obj = date_input
         
-        return date_obj.strftime('%d%m%Y')
+        return f"{date_obj.day:02d}{date_obj.month:02d}{date_obj.year:04d}"
     
     def _format_amount_ebp(self, amount) -> str:
         """Format amount for EBP (15 chars, right-aligned, 2 decimals)"""
         
-        if amount is None:
-            amount = 0
+        if amount is None or amount == 0:
+            return _ZERO_AMOUNT_EBP
         
-        # Convert to cents (EBP often uses cents for precision)
-        cents = int(round(float(amount) * 100))
+        # Convert to cents (EBP often uses cents for precision), rounding
+        # half-up on the decimal value whatever the input type
+        if type(amount) is int:
+            cents = amount * 100
+        else:
+            if not isinstance(amount, Decimal):
+                amount = Decimal(repr(float(amount)))
+            cents = int((amount * 100).to_integral_value(ROUND_HALF_UP))
         
-        # Format as string with sign
-        amount_str = f"{cents:+013d}"  # 13 digits + sign = 14 chars
+        # Sign + 12 zero-padded digits, right-aligned on 15 chars in one format call
+        if -_MAX_FIXED_WIDTH_CENTS < cents < _MAX_FIXED_WIDTH_CENTS:
+            return f"  {cents:+013d}"
         
-        return amount_str.rjust(15)
+        return f"{cents:+013d}".rjust(15)
     
     def _get_vendor_account(self, vendor: Optional[FrenchBusinessInfo]) -> str:
         """Get vendor account code"""
@@ -292,61 +422,22 @@ class EBPExporter:
     def _get_tva_code(self, rate: float) -> str:
         """Get TVA code for EBP"""
         
-        tva_codes = {
-            20.0: 'T20',
-            10.0: 'T10',
-            5.5: 'T55',
-            2.1: 'T21',
-            0.0: 'T00'
-        }
-        
-        return tva_codes.get(rate, 'T20')
+        return _TVA_CODES.get(rate, 'T20')
     
     def _get_tva_account(self, rate: float) -> str:
         """Get TVA account code"""
         
-        tva_accounts = {
-            20.0: '445662',  # TVA déductible 20%
-            10.0: '445661',  # TVA déductible 10%
-            5.5: '445663',   # TVA déductible 5.5%
-            2.1: '445664',   # TVA déductible 2.1%
-            0.0: '445660'    # TVA déductible 0%
-        }
-        
-        return tva_accounts.get(rate, '445662')
-    
-    def _get_main_tva_code(self, invoice: InvoiceData) -> str:
-        """Get main TVA code for invoice"""
-        
-        if invoice.tva_breakdown:
-            # Use the TVA rate with highest amount
-            main_tva = max(invoice.tva_breakdown, key=lambda x: x.tva_amount)
-            return self._get_tva_code(main_tva.rate)
-        
-        return 'T20'  # Default to 20%
+        return _TVA_ACCOUNTS.get(rate, '445662')
     
     def _determine_account_code(self, description: str) -> str:
         """Determine account code based on item description (simplified)"""
         
         # This is a simplified mapping - in practice, you'd want more sophisticated categorization
-        description_lower = description.lower()
-        
-        if any(word in description_lower for word in ['service', 'prestation', 'consultation']):
-            return '606000'  # Services
-        elif any(word in description_lower for word in ['matériel', 'équipement', 'machine']):
-            return '606100'  # Equipment
-        elif any(word in description_lower for word in ['fourniture', 'matière', 'produit']):
-            return '607000'  # Supplies
-        else:
-            return '607000'  # Default to supplies
-    
-    def _truncate(self, text: str, max_length: int) -> str:
-        """Truncate text to maximum length"""
+        for pattern, account_code in _ACCOUNT_PATTERNS:
+            if pattern.search(description):
+                return account_code
         
-        if not text:
-            return ''
-        
-        return text[:max_length]
+        return '607000'  # Default to supplies
     
     def get_export_info(self) -> Dict[str, Any]:
         """Get information about this export format"""
@@ -374,6 +465,10 @@ class EBPExporter:
         }
 
 
+# Exporters hold no per-export state, so one is shared
+_DEFAULT_EXPORTER = EBPExporter()
+
+
 def export_to_ebp_ascii(invoice: InvoiceData) -> str:
     """
     Convenience function to export a single invoice to EBP ASCII format
@@ -384,8 +479,20 @@ def export_to_ebp_ascii(invoice: InvoiceData) -> str:
     Returns:
         EBP ASCII formatted string
     """
-    exporter = EBPExporter()
-    return exporter.export_invoice(invoice)
+    return _DEFAULT_EXPORTER.export_invoice(invoice)
+
+
+def export_to_ebp_ascii_bytes(invoice: InvoiceData) -> bytes:
+    """
+    Convenience function to export a single invoice to EBP ASCII format as Windows-1252 bytes
+    
+    Args:
+        invoice: Invoice data to export
+        
+    Returns:
+        EBP ASCII encoded content
+    """
+    return _DEFAULT_EXPORTER.export_invoice_bytes(invoice)
 
 
 def export_batch_to_ebp_ascii(invoices: List[InvoiceData]) -> str:
@@ -398,5 +505,17 @@ def export_batch_to_ebp_ascii(invoices: List[InvoiceData]) -> str:
     Returns:
         EBP ASCII formatted string for all invoices
     """
-    exporter = EBPExporter()
-    return exporter.export_batch(invoices)
\ No newline at end of file
+    return _DEFAULT_EXPORTER.export_batch(invoices)
+
+
+def export_batch_to_ebp_ascii_bytes(invoices: List[InvoiceData]) -> bytes:
+    """
+    Convenience function to export multiple invoices to EBP ASCII format as Windows-1252 bytes
+    
+    Args:
+        invoices: List of invoice data to export
+        
+    Returns:
+        EBP ASCII encoded content for all invoices
+    """
+    return _DEFAULT_EXPORTER.export_batch_bytes(invoices)
\ No newline at end of file
@@ -10,13 +10,107 @@ Complies with:
 - DGFiP specifications for computerized accounting files
 """
 
+import calendar
 import csv
 import io
+import math
+import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from decimal import Decimal
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Iterable, Iterator, BinaryIO
+from decimal import Decimal, ROUND_HALF_UP
 
 from schemas.invoice import InvoiceData, FrenchBusinessInfo
+from api.exports.dates import parse_date_string
+
+_STREAM_BUFFER_SIZE = 64 * 1024
+
+# Fixed column values shared by every row
+_NO_VALUE = ''
+_CURRENCY = 'EUR'
+_SUPPLIER_ACCOUNT_LABEL = 'Fournisseurs'
+
+_CENT = Decimal('0.01')
+
+_JOURNAL_NAMES = {
+    'ACH': 'Achats',
+    'VTE': 'Ventes',
+    'BQ': 'Banque',
+    'CAS': 'Caisse',
+    'OD': 'Opérations diverses'
+}
+
+_ACCOUNT_NAMES = {
+    '401000': 'Fournisseurs',
+    '607000': 'Achats de marchandises',
+    '606200': 'Matériel et équipements',
+    '611000': 'Services extérieurs',
+    '624100': 'Transport de biens',
+    '623000': 'Publicité et relations publiques',
+    '616000': 'Primes d\'assurance',
+    '613000': 'Locations',
+    '445662': 'TVA déductible sur biens',
+    '445663': 'TVA déductible sur services'
+}
+
+# French TVA accounts (Plan Comptable Général)
+_TVA_ACCOUNTS = {
+    20.0: '445662',  # TVA déductible sur biens
+    10.0: '445663',  # TVA déductible sur services
+    5.5: '445663',   # TVA déductible sur services (reduced rate)
+    2.1: '445663',   # TVA déductible sur services (super reduced)
+    0.0: '445660'    # TVA déductible (exempt)
+}
+
+# Anything str.isalnum() rejects, stripped from names to build account codes
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+# The column separator and line breaks would split a row, so free-text columns
+# (CompteLib, CompAuxLib, PieceRef, EcritureLib) have them replaced by spaces
+_FEC_TEXT_TRANSLATION = str.maketrans({'|': ' ', '\r': ' ', '\n': ' '})
+
+_FEC_DATE_RE = re.compile(r'\A([0-9]{4})([0-9]{2})([0-9]{2})\Z')
+
+# French Chart of Accounts (Plan Comptable Général) expense accounts, checked in
+# priority order so a description matching several categories keeps the first one
+_EXPENSE_ACCOUNT_PATTERNS = (
+    (re.compile('service|prestation|consultation|formation|conseil', re.IGNORECASE),
+     '611000'),  # Services extérieurs
+    (re.compile('matériel|équipement|machine|ordinateur|informatique', re.IGNORECASE),
+     '606200'),  # Matériel et équipements
+    (re.compile('fourniture|matière|produit|stock', re.IGNORECASE),
+     '607000'),  # Achats de marchandises
+    (re.compile('transport|livraison|expédition', re.IGNORECASE),
+     '624100'),  # Transport de biens
+    (re.compile('communication|téléphone|internet|publicité', re.IGNORECASE),
+     '623000'),  # Publicité, publications, relations publiques
+    (re.compile('assurance|responsabilité', re.IGNORECASE),
+     '616000'),  # Primes d'assurance
+    (re.compile('location|loyer|bail', re.IGNORECASE),
+     '613000')  # Locations
+)
+
+
+def _fec_text(text: str) -> str:
+    """Make a free-text value safe to place in a pipe-separated FEC row"""
+    return text.translate(_FEC_TEXT_TRANSLATION)
+
+
+@lru_cache(maxsize=4096)
+def _supplier_aux_account(siren_number: Optional[str], siret_number: Optional[str],
+                          name: Optional[str]) -> str:
+    """Supplier auxiliary account from SIREN, SIRET or name, cached per vendor identity"""
+    
+    if siren_number:
+        # Use SIREN for auxiliary account
+        return siren_number
+    elif siret_number:
+        # Use SIRET if no SIREN
+        return siret_number
+    else:
+        # Generate from name
+        name_clean = _NON_ALNUM.sub('', name or 'FOUR')[:8]
+        return name_clean.upper()
 
 
 class FECExporter:
@@ -48,6 +142,11 @@ class FECExporter:
             'Montantdevise',     # Montant en devise
             'Idevise'            # Identifiant de la devise
         ]
+        
+        # Entries are tuples in fec_headers order; these map names to positions
+        self._header_line = self.separator.join(self.fec_headers)
+        self._header_bytes = (self._header_line + '\n').encode('utf-8')
+        self._field_idx = {name: i for i, name in enumerate(self.fec_headers)}
     
     def export_invoice(self, invoice: InvoiceData, journal_code: str = "ACH", 
                       sequence_number: int = 1) -> str:
@@ -62,15 +161,11 @@ class FECExporter:
         Returns:
             FEC formatted string
         """
-        entries = []
-        
-        # Generate accounting entries for the invoice
-        invoice_entries = self._generate_invoice_entries(
-            invoice, journal_code, sequence_number
+        today_fec = datetime.now().strftime('%Y%m%d')
+        supplier = self._get_supplier_columns(invoice.vendor)
+        return self._format_fec_output(
+            self._iter_invoice_rows(invoice, journal_code, sequence_number, today_fec, supplier)
         )
-        entries.extend(invoice_entries)
-        
-        return self._format_fec_output(entries)
     
     def export_batch(self, invoices: List[InvoiceData], 
                     journal_code: str = "ACH") -> str:
@@ -84,155 +179,218 @@ class FECExporter:
         Returns:
             FEC formatted string for all invoices
         """
-        all_entries = []
+        return self._format_fec_output(self._iter_batch_rows(invoices, journal_code))
+    
+    def export_batch_bytes(self, invoices: List[InvoiceData],
+                           journal_code: str = "ACH") -> bytes:
+        """
+        Export multiple invoices to FEC format as UTF-8 bytes
+        
+        Rows are encoded straight into one growing buffer, so file writers
+        can use this directly and skip encoding a full str export.
+        
+        Args:
+            invoices: List of invoice data to export
+            journal_code: Journal code for all invoices
+            
+        Returns:
+            FEC encoded content for all invoices
+        """
+        return self._format_fec_output_bytes(self._iter_batch_rows(invoices, journal_code))
+    
+    def export_batch_to_stream(self, invoices: List[InvoiceData], sink: BinaryIO,
+                               journal_code: str = "ACH") -> None:
+        """
+        Write a FEC batch export to a binary file object
+        
+        Rows are produced one at a time and written in 64 KiB UTF-8 chunks,
+        so memory stays flat however many invoices the batch holds.
+        
+        Args:
+            invoices: List of invoice data to export
+            sink: Binary file object to write the export to
+            journal_code: Journal code for all invoices
+        """
+        separator = self.separator
+        chunk = [self._header_line, '\n']
+        pending = len(self._header_line) + 1
+        
+        for line in map(separator.join, self._iter_batch_rows(invoices, journal_code)):
+            chunk.append(line)
+            chunk.append('\n')
+            pending += len(line) + 1
+            if pending >= _STREAM_BUFFER_SIZE:
+                sink.write(''.join(chunk).encode('utf-8'))
+                chunk.clear()
+                pending = 0
+        
+        if chunk:
+            sink.write(''.join(chunk).encode('utf-8'))
+    
+    def _iter_batch_rows(self, invoices: Iterable[InvoiceData],
+                         journal_code: str) -> Iterator[Tuple[str, ...]]:
+        """Yield the rows of every invoice, numbering entries sequentially across the batch"""
+        
         sequence_counter = 1
+        today_fec = datetime.now().strftime('%Y%m%d')  # Shared by the whole batch
         
-        for invoice in invoices:
-            invoice_entries = self._generate_invoice_entries(
-                invoice, journal_code, sequence_counter
-            )
-            all_entries.extend(invoice_entries)
-            sequence_counter += len(invoice_entries)
+        # Supplier columns per vendor object, since batches usually repeat a
+        # few vendors; the vendor is kept in the value so its id stays unique
+        supplier_cache: Dict[int, Tuple[Optional[FrenchBusinessInfo], Tuple[str, str, str]]] = {}
         
-        return self._format_fec_output(all_entries)
+        for invoice in invoices:
+            vendor = invoice.vendor
+            cached = supplier_cache.get(id(vendor))
+            if cached is None:
+                cached = supplier_cache[id(vendor)] = (vendor, self._get_supplier_columns(vendor))
+            
+            for row in self._iter_invoice_rows(invoice, journal_code, sequence_counter,
+                                               today_fec, cached[1]):
+                yield row
+                sequence_counter += 1
     
-    def _generate_invoice_entries(self, invoice: InvoiceData, 
-                                journal_code: str, 
-                                base_sequence: int) -> List[Dict[str, str]]:
-        """Generate FEC accounting entries for an invoice"""
+    def _iter_invoice_rows(self, invoice: InvoiceData,
+                           journal_code: str,
+                           base_sequence: int,
+                           today_fec: str,
+                           supplier: Tuple[str, str, str]) -> Iterator[Tuple[str, ...]]:
+        """Yield FEC accounting entries for an invoice, as rows in fec_headers order"""
         
-        entries = []
         sequence = base_sequence
-        
-        # Entry date (comptabilization date)
-        entry_date = self._format_fec_date(invoice.date)
-        piece_date = self._format_fec_date(invoice.date)
-        validation_date = self._format_fec_date(datetime.now().date())
+        supplier_account, supplier_aux_account, supplier_name = supplier
+        
+        # Per-invoice invariants, computed once rather than on every row
+        journal_lib = self._get_journal_name(journal_code)
+        entry_date = piece_date = self._format_fec_date(invoice.date, today_fec)  # Comptabilization date
+        validation_date = today_fec
+        invoice_number = _fec_text(invoice.invoice_number) if invoice.invoice_number else None
+        piece_ref = invoice_number or f"FACT{base_sequence}"
+        invoice_ref = invoice_number or base_sequence
+        format_amount = self._format_fec_amount
+        zero_amount = format_amount(0)
+        total_amount = format_amount(invoice.total_ttc or invoice.total or 0)
+        determine_expense_account = self._determine_expense_account
+        get_account_name = self._get_account_name
         
         # 1. Supplier account credit entry (401xxx)
-        supplier_entry = {
-            'JournalCode': journal_code,
-            'JournalLib': self._get_journal_name(journal_code),
-            'EcritureNum': str(sequence),
-            'EcritureDate': entry_date,
-            'CompteNum': self._get_supplier_account(invoice.vendor),
-            'CompteLib': 'Fournisseurs',
-            'CompAuxNum': self._get_supplier_aux_account(invoice.vendor),
-            'CompAuxLib': self._get_supplier_name(invoice.vendor)[:100],  # Max 100 chars
-            'PieceRef': invoice.invoice_number or f"FACT{sequence}",
-            'PieceDate': piece_date,
-            'EcritureLib': f"Facture {invoice.invoice_number or sequence}"[:100],
-            'Debit': self._format_fec_amount(0),
-            'Credit': self._format_fec_amount(invoice.total_ttc or invoice.total or 0),
-            'EcritureLet': '',
-            'DateLet': '',
-            'ValidDate': validation_date,
-            'Montantdevise': self._format_fec_amount(invoice.total_ttc or invoice.total or 0),
-            'Idevise': 'EUR'
-        }
-        entries.append(supplier_entry)
+        supplier_entry = (
+            journal_code,  # JournalCode
+            journal_lib,  # JournalLib
+            str(sequence),  # EcritureNum
+            entry_date,  # EcritureDate
+            supplier_account,  # CompteNum
+            _SUPPLIER_ACCOUNT_LABEL,  # CompteLib
+            supplier_aux_account,  # CompAuxNum
+            supplier_name,  # CompAuxLib
+            piece_ref,  # PieceRef
+            piece_date,  # PieceDate
+            f"Facture {invoice_ref}"[:100],  # EcritureLib
+            zero_amount,  # Debit
+            total_amount,  # Credit
+            _NO_VALUE,  # EcritureLet
+            _NO_VALUE,  # DateLet
+            validation_date,  # ValidDate
+            total_amount,  # Montantdevise
+            _CURRENCY  # Idevise
+        )
+        yield supplier_entry
         sequence += 1
         
         # 2. Expense account debit entries (6xxxxx)
         for item in invoice.line_items:
-            expense_account = self._determine_expense_account(item.description)
+            expense_account = determine_expense_account(item.description)
+            item_amount = format_amount(item.total)
             
-            item_entry = {
-                'JournalCode': journal_code,
-                'JournalLib': self._get_journal_name(journal_code),
-                'EcritureNum': str(sequence),
-                'EcritureDate': entry_date,
-                'CompteNum': expense_account,
-                'CompteLib': self._get_account_name(expense_account),
-                'CompAuxNum': '',
-                'CompAuxLib': '',
-                'PieceRef': invoice.invoice_number or f"FACT{base_sequence}",
-                'PieceDate': piece_date,
-                'EcritureLib': item.description[:100] if item.description else f"Article {sequence}",
-                'Debit': self._format_fec_amount(item.total),
-                'Credit': self._format_fec_amount(0),
-                'EcritureLet': '',
-                'DateLet': '',
-                'ValidDate': validation_date,
-                'Montantdevise': self._format_fec_amount(item.total),
-                'Idevise': 'EUR'
-            }
-            entries.append(item_entry)
+            item_entry = (
+                journal_code,  # JournalCode
+                journal_lib,  # JournalLib
+                str(sequence),  # EcritureNum
+                entry_date,  # EcritureDate
+                expense_account,  # CompteNum
+                get_account_name(expense_account),  # CompteLib
+                _NO_VALUE,  # CompAuxNum
+                _NO_VALUE,  # CompAuxLib
+                piece_ref,  # PieceRef
+                piece_date,  # PieceDate
+                _fec_text(item.description)[:100] if item.description else f"Article {sequence}",  # EcritureLib
+                item_amount,  # Debit
+                zero_amount,  # Credit
+                _NO_VALUE,  # EcritureLet
+                _NO_VALUE,  # DateLet
+                validation_date,  # ValidDate
+                item_amount,  # Montantdevise
+                _CURRENCY  # Idevise
+            )
+            yield item_entry
             sequence += 1
         
         # 3. TVA debit entries (445xxx)
         for tva_item in invoice.tva_breakdown:
             if tva_item.tva_amount > 0:  # Only create entry if TVA amount > 0
                 tva_account = self._get_tva_account(tva_item.rate)
+                tva_amount = format_amount(tva_item.tva_amount)
                 
-                tva_entry = {
-                    'JournalCode': journal_code,
-                    'JournalLib': self._get_journal_name(journal_code),
-                    'EcritureNum': str(sequence),
-                    'EcritureDate': entry_date,
-                    'CompteNum': tva_account,
-                    'CompteLib': f"TVA déductible {tva_item.rate}%",
-                    'CompAuxNum': '',
-                    'CompAuxLib': '',
-                    'PieceRef': invoice.invoice_number or f"FACT{base_sequence}",
-                    'PieceDate': piece_date,
-                    'EcritureLib': f"TVA {tva_item.rate}% sur facture {invoice.invoice_number or base_sequence}"[:100],
-                    'Debit': self._format_fec_amount(tva_item.tva_amount),
-                    'Credit': self._format_fec_amount(0),
-                    'EcritureLet': '',
-                    'DateLet': '',
-                    'ValidDate': validation_date,
-                    'Montantdevise': self._format_fec_amount(tva_item.tva_amount),
-                    'Idevise': 'EUR'
-                }
-                entries.append(tva_entry)
+                tva_entry = (
+                    journal_code,  # JournalCode
+                    journal_lib,  # JournalLib
+                    str(sequence),  # EcritureNum
+                    entry_date,  # EcritureDate
+                    tva_account,  # CompteNum
+                    _fec_text(f"TVA déductible {tva_item.rate}%"),  # CompteLib
+                    _NO_VALUE,  # CompAuxNum
+                    _NO_VALUE,  # CompAuxLib
+                    piece_ref,  # PieceRef
+                    piece_date,  # PieceDate
+                    f"TVA {tva_item.rate}% sur facture {invoice_ref}"[:100],  # EcritureLib
+                    tva_amount,  # Debit
+                    zero_amount,  # Credit
+                    _NO_VALUE,  # EcritureLet
+                    _NO_VALUE,  # DateLet
+                    validation_date,  # ValidDate
+                    tva_amount,  # Montantdevise
+                    _CURRENCY  # Idevise
+                )
+                yield tva_entry
                 sequence += 1
-        
-        return entries
     
-    def _format_fec_output(self, entries: List[Dict[str, str]]) -> str:
+    def _format_fec_output(self, entries: Iterable[Tuple[str, ...]]) -> str:
         """Format entries as FEC file content"""
         
-        output = io.StringIO()
-        writer = csv.DictWriter(
-            output, 
-            fieldnames=self.fec_headers, 
-            delimiter=self.separator,
-            quoting=csv.QUOTE_NONE,
-            escapechar=None,
-            lineterminator='\\n'
-        )
+        # Free-text fields are cleaned of separators and line breaks when the
+        # rows are built, so rows are joined directly rather than going
+        # through csv.DictWriter
+        separator = self.separator
+        lines = [self._header_line]
+        lines.extend(map(separator.join, entries))
+        lines.append('')  # Trailing newline after the last entry
         
-        # Write header
-        writer.writeheader()
+        return '\n'.join(lines)
+    
+    def _format_fec_output_bytes(self, entries: Iterable[Tuple[str, ...]]) -> bytes:
+        """Format entries as UTF-8 FEC file content, accumulated in a single bytearray"""
         
-        # Write entries
-        for entry in entries:
-            writer.writerow(entry)
+        separator = self.separator
+        buf = bytearray(self._header_bytes)
         
-        content = output.getvalue()
-        output.close()
+        for line in map(separator.join, entries):
+            buf += line.encode('utf-8')
+            buf += b'\n'
         
-        return content
+        return bytes(buf)
     
-    def _format_fec_date(self, date_input) -> str:
-        """Format date for FEC (YYYYMMDD)"""
+    def _format_fec_date(self, date_input, today_fec: Optional[str] = None) -> str:
+        """Format date for FEC (YYYYMMDD), falling back to today_fec or the current date"""
         
         if not date_input:
-            return datetime.now().strftime('%Y%m%d')
+            return today_fec or datetime.now().strftime('%Y%m%d')
         
-        if isinstance(date_input, str):
-            try:
-                # Try to parse ISO format
-                date_obj = datetime.strptime(date_input, '%Y-%m-%d').date()
-            except ValueError:
-                try:
-                    # Try French format
-                    date_obj = datetime.strptime(date_input, '%d/%m/%Y').date()
-                except ValueError:
-                    return datetime.now().strftime('%Y%m%d')
-        else:
-            date_obj = date_input
+        # date and datetime objects, the usual case
+        if hasattr(date_input, 'strftime'):
+            return date_input.strftime('%Y%m%d')
+        
+        date_obj = parse_date_string(date_input)
+        if date_obj is None:
+            return today_fec or datetime.now().strftime('%Y%m%d')
         
         return date_obj.strftime('%Y%m%d')
     
@@ -242,6 +400,15 @@ class FECExporter:
         if amount is None or amount == 0:
             return ''  # Empty for zero amounts in FEC
         
+        # Exact type checks for the common cases, cheaper than isinstance
+        amount_type = type(amount)
+        if amount_type is int:
+            return format(amount, '.2f')
+        
+        # Decimals are rounded exactly rather than through a float
+        if amount_type is Decimal:
+            return str(amount.quantize(_CENT, rounding=ROUND_HALF_UP))
+        
         # Convert to float if needed
         if isinstance(amount, str):
             try:
@@ -249,21 +416,23 @@ class FECExporter:
             except ValueError:
                 return ''
         
-        # Format with 2 decimal places, dot as separator
-        return f"{float(amount):.2f}"
+        # Floats are rounded half-up on their shortest decimal form, like Decimals
+        # and the other exporters, rather than by binary '.2f' formatting
+        return str(Decimal(repr(float(amount))).quantize(_CENT, rounding=ROUND_HALF_UP))
     
     def _get_journal_name(self, journal_code: str) -> str:
         """Get journal name from code"""
         
-        journal_names = {
-            'ACH': 'Achats',
-            'VTE': 'Ventes',
-            'BQ': 'Banque',
-            'CAS': 'Caisse',
-            'OD': 'Opérations diverses'
-        }
+        return _JOURNAL_NAMES.get(journal_code, 'Journal')
+    
+    def _get_supplier_columns(self, vendor: Optional[FrenchBusinessInfo]) -> Tuple[str, str, str]:
+        """Get the supplier account, auxiliary account and name (max 100 chars) columns"""
         
-        return journal_names.get(journal_code, 'Journal')
+        return (
+            self._get_supplier_account(vendor),
+            self._get_supplier_aux_account(vendor),
+            _fec_text(self._get_supplier_name(vendor))[:100]
+        )
     
     def _get_supplier_account(self, vendor: Optional[FrenchBusinessInfo]) -> str:
         """Get supplier general account (401xxx)"""
@@ -276,16 +445,7 @@ class FECExporter:
         if not vendor:
             return 'FOUR001'
         
-        if vendor.siren_number:
-            # Use SIREN for auxiliary account
-            return vendor.siren_number
-        elif vendor.siret_number:
-            # Use SIRET if no SIREN
-            return vendor.siret_number
-        else:
-            # Generate from name
-            name_clean = ''.join(c for c in (vendor.name or 'FOUR') if c.isalnum())[:8]
-            return name_clean.upper()
+        return _supplier_aux_account(vendor.siren_number, vendor.siret_number, vendor.name)
     
     def _get_supplier_name(self, vendor: Optional[FrenchBusinessInfo]) -> str:
         """Get supplier name for FEC"""
@@ -301,120 +461,125 @@ class FECExporter:
         if not description:
             return '607000'  # Default supplies account
         
-        description_lower = description.lower()
-        
-        # French Chart of Accounts (Plan Comptable Général)
-        if any(word in description_lower for word in [
-            'service', 'prestation', 'consultation', 'formation', 'conseil'
-        ]):
-            return '611000'  # Services extérieurs
-        elif any(word in description_lower for word in [
-            'matériel', 'équipement', 'machine', 'ordinateur', 'informatique'
-        ]):
-            return '606200'  # Matériel et équipements
-        elif any(word in description_lower for word in [
-            'fourniture', 'matière', 'produit', 'stock'
-        ]):
-            return '607000'  # Achats de marchandises
-        elif any(word in description_lower for word in [
-            'transport', 'livraison', 'expédition'
-        ]):
-            return '624100'  # Transport de biens
-        elif any(word in description_lower for word in [
-            'communication', 'téléphone', 'internet', 'publicité'
-        ]):
-            return '623000'  # Publicité, publications, relations publiques
-        elif any(word in description_lower for word in [
-            'assurance', 'responsabilité'
-        ]):
-            return '616000'  # Primes d\'assurance
-        elif any(word in description_lower for word in [
-            'location', 'loyer', 'bail'
-        ]):
-            return '613000'  # Locations
-        else:
-            return '607000'  # Default to supplies
+        for pattern, account_code in _EXPENSE_ACCOUNT_PATTERNS:
+            if pattern.search(description):
+                return account_code
+        
+        return '607000'  # Default to supplies
     
     def _get_account_name(self, account_code: str) -> str:
         """Get account name from code"""
         
-        account_names = {
-            '401000': 'Fournisseurs',
-            '607000': 'Achats de marchandises',
-            '606200': 'Matériel et équipements',
-            '611000': 'Services extérieurs',
-            '624100': 'Transport de biens',
-            '623000': 'Publicité et relations publiques',
-            '616000': 'Primes d\'assurance',
-            '613000': 'Locations',
-            '445662': 'TVA déductible sur biens',
-            '445663': 'TVA déductible sur services'
-        }
-        
-        return account_names.get(account_code, 'Compte')
+        return _fec_text(_ACCOUNT_NAMES.get(account_code, 'Compte'))
     
     def _get_tva_account(self, rate: float) -> str:
         """Get TVA account based on rate"""
         
-        # French TVA accounts (Plan Comptable Général)
-        tva_accounts = {
-            20.0: '445662',  # TVA déductible sur biens
-            10.0: '445663',  # TVA déductible sur services
-            5.5: '445663',   # TVA déductible sur services (reduced rate)
-            2.1: '445663',   # TVA déductible sur services (super reduced)
-            0.0: '445660'    # TVA déductible (exempt)
-        }
-        
-        return tva_accounts.get(rate, '445662')
+        return _TVA_ACCOUNTS.get(rate, '445662')
     
     def validate_fec_compliance(self, entries: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Validate FEC compliance"""
+        """Validate FEC compliance of entries given as dicts keyed by FEC field name"""
         
-        errors = []
-        warnings = []
+        fec_headers = self.fec_headers
+        return self.validate_fec_compliance_rows(
+            [entry.get(field) or '' for field in fec_headers] for entry in entries
+        )
+    
+    def validate_fec_compliance_rows(self, rows: Iterable[Sequence[str]]) -> Dict[str, Any]:
+        """
+        Validate FEC compliance of rows in fec_headers order, consumed in a single pass
         
-        # Check balanced entries
-        total_debit = 0
-        total_credit = 0
+        Args:
+            rows: Rows to validate; may be a lazy iterator such as a csv.reader
+            
+        Returns:
+            Validation results
+        """
+        warnings = []
+        field_idx = self._field_idx
+        debit_idx = field_idx['Debit']
+        credit_idx = field_idx['Credit']
+        num_idx = field_idx['EcritureNum']
+        required_fields = tuple(
+            (field, field_idx[field])
+            for field in ('JournalCode', 'EcritureDate', 'CompteNum', 'PieceRef')
+        )
+        date_fields = tuple(
+            (field, field_idx[field])
+            for field in ('EcritureDate', 'PieceDate', 'ValidDate')
+        )
         
-        for entry in entries:
+        # Single pass over the entries; errors are kept per check so the
+        # report lists them in the same order as the checks below
+        amount_errors = []
+        field_errors = []
+        date_errors = []
+        number_errors = []
+        debits = []
+        credits = []
+        valid_dates = set()  # Dates repeat across entries, so each is checked once
+        previous_number = None
+        sequential = True
+        total_entries = 0
+        
+        for i, entry in enumerate(rows, 1):
+            total_entries = i
+            
+            # Amounts for the balance check
+            try:
+                debit = float(entry[debit_idx] or '0')
+                credit = float(entry[credit_idx] or '0')
+                debits.append(debit)
+                credits.append(credit)
+            except ValueError:
+                amount_errors.append(f"Invalid amount in entry {entry[num_idx] or '?'}")
+            
+            # Required fields
+            for field, idx in required_fields:
+                if not entry[idx]:
+                    field_errors.append(f"Missing required field '{field}' in entry {i}")
+            
+            # Date format
+            for date_field, idx in date_fields:
+                date_value = entry[idx]
+                if not date_value or date_value in valid_dates:
+                    continue
+                if self._is_valid_fec_date(date_value):
+                    valid_dates.add(date_value)
+                else:
+                    date_errors.append(f"Invalid date format in entry {i}, field {date_field}: {date_value}")
+            
+            # Sequential numbering
             try:
-                debit = float(entry.get('Debit', '0') or '0')
-                credit = float(entry.get('Credit', '0') or '0')
-                total_debit += debit
-                total_credit += credit
+                number = int(entry[num_idx] or '0')
             except ValueError:
-                errors.append(f"Invalid amount in entry {entry.get('EcritureNum', '?')}")
+                number_errors.append(f"Invalid entry number in entry {i}: {entry[num_idx]}")
+                continue
+            if previous_number is not None and number < previous_number:
+                sequential = False
+            previous_number = number
         
-        # Check if entries are balanced
+        errors = amount_errors
+        
+        # Check if entries are balanced (fsum avoids accumulated rounding error)
+        total_debit = math.fsum(debits)
+        total_credit = math.fsum(credits)
         if abs(total_debit - total_credit) > 0.01:
             errors.append(f"Entries not balanced: Debit {total_debit:.2f} != Credit {total_credit:.2f}")
         
-        # Check required fields
-        required_fields = ['JournalCode', 'EcritureDate', 'CompteNum', 'PieceRef']
-        for i, entry in enumerate(entries):
-            for field in required_fields:
-                if not entry.get(field):
-                    errors.append(f"Missing required field '{field}' in entry {i+1}")
-        
-        # Check date format
-        for i, entry in enumerate(entries):
-            date_fields = ['EcritureDate', 'PieceDate', 'ValidDate']
-            for date_field in date_fields:
-                date_value = entry.get(date_field)
-                if date_value and not self._is_valid_fec_date(date_value):
-                    errors.append(f"Invalid date format in entry {i+1}, field {date_field}: {date_value}")
-        
-        # Check sequential numbering (warning only)
-        sequence_numbers = [int(entry.get('EcritureNum', '0')) for entry in entries]
-        if sequence_numbers != sorted(sequence_numbers):
+        errors.extend(field_errors)
+        errors.extend(date_errors)
+        errors.extend(number_errors)
+        
+        # Sequential numbering is a warning only
+        if not sequential:
             warnings.append("Entry numbers are not sequential")
         
         return {
             'is_compliant': len(errors) == 0,
             'errors': errors,
             'warnings': warnings,
-            'total_entries': len(entries),
+            'total_entries': total_entries,
             'total_debit': total_debit,
             'total_credit': total_credit
         }
@@ -422,14 +587,18 @@ class FECExporter:
     def _is_valid_fec_date(self, date_str: str) -> bool:
         """Check if date string is valid FEC format (YYYYMMDD)"""
         
-        if not date_str or len(date_str) != 8:
+        if not date_str:
             return False
         
-        try:
-            datetime.strptime(date_str, '%Y%m%d')
-            return True
-        except ValueError:
+        match = _FEC_DATE_RE.match(date_str)
+        if not match:
             return False
+        
+        year, month, day = map(int, match.groups())
+        if year < 1 or not 1 <= month <= 12 or day < 1:
+            return False
+        
+        return day <= calendar.monthrange(year, month)[1]
     
     def get_export_info(self) -> Dict[str, Any]:
         """Get information about FEC export format"""
@@ -460,6 +629,10 @@ class FECExporter:
         }
 
 
+# Exporters hold no per-export state, so one is shared by the module functions
+_DEFAULT_EXPORTER = FECExporter()
+
+
 def export_to_fec(invoice: InvoiceData, journal_code: str = "ACH", 
                  sequence_number: int = 1) -> str:
     """
@@ -473,8 +646,7 @@ def export_to_fec(invoice: InvoiceData, journal_code: str = "ACH",
     Returns:
         FEC formatted string
     """
-    exporter = FECExporter()
-    return exporter.export_invoice(invoice, journal_code, sequence_number)
+    return _DEFAULT_EXPORTER.export_invoice(invoice, journal_code, sequence_number)
 
 
 def export_batch_to_fec(invoices: List[InvoiceData], 
@@ -489,8 +661,22 @@ def export_batch_to_fec(invoices: List[InvoiceData],
     Returns:
         FEC formatted string for all invoices
     """
-    exporter = FECExporter()
-    return exporter.export_batch(invoices, journal_code)
+    return _DEFAULT_EXPORTER.export_batch(invoices, journal_code)
+
+
+def export_batch_to_fec_bytes(invoices: List[InvoiceData],
+                              journal_code: str = "ACH") -> bytes:
+    """
+    Convenience function to export multiple invoices to FEC format as UTF-8 bytes
+    
+    Args:
+        invoices: List of invoice data to export
+        journal_code: Journal code for all invoices
+        
+    Returns:
+        FEC encoded content for all invoices
+    """
+    return _DEFAULT_EXPORTER.export_batch_bytes(invoices, journal_code)
 
 
 def validate_fec_file(fec_content: str) -> Dict[str, Any]:
@@ -503,21 +689,35 @@ def validate_fec_file(fec_content: str) -> Dict[str, Any]:
     Returns:
         Validation results
     """
-    exporter = FECExporter()
+    exporter = _DEFAULT_EXPORTER
     
-    # Parse FEC content back to entries
-    lines = fec_content.strip().split('\\n')
-    if not lines:
+    if not fec_content.strip():
         return {'is_compliant': False, 'errors': ['Empty FEC file']}
     
-    # Skip header line
-    entries = []
-    reader = csv.DictReader(lines, delimiter=exporter.separator)
+    # Parse FEC content back to rows, streaming it line by line
+    reader = csv.reader(io.StringIO(fec_content), delimiter=exporter.separator,
+                        quoting=csv.QUOTE_NONE)
     
     try:
-        for row in reader:
-            entries.append(row)
+        return exporter.validate_fec_compliance_rows(
+            _iter_fec_file_rows(reader, len(exporter.fec_headers))
+        )
     except csv.Error as e:
         return {'is_compliant': False, 'errors': [f'CSV parsing error: {e}']}
+
+
+def _iter_fec_file_rows(reader: Iterator[List[str]], column_count: int) -> Iterator[List[str]]:
+    """Yield the entry rows of a parsed FEC file, skipping blank lines and the header"""
+    
+    header_seen = False
     
-    return exporter.validate_fec_compliance(entries)
\ No newline at end of file
+    for row in reader:
+        if not row:
+            continue
+        if not header_seen:
+            header_seen = True
+            continue
+        # Pad short rows so every column can be indexed
+        if len(row) < column_count:
+            row += [''] * (column_count - len(row))
+        yield row
@@ -18,14 +18,18 @@ Designed for daily production use by expert-comptables with zero tolerance for e
 """
 
 import io
+import itertools
 import logging
+import re
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, TextIO
 from decimal import Decimal, ROUND_HALF_UP
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 from schemas.invoice import InvoiceData, FrenchBusinessInfo, FrenchTVABreakdown, LineItem
+from api.exports.dates import parse_date_string
 from core.validation.french_validator import validate_french_invoice_sync
 from core.validation.tva_validator import TVACalculator, get_product_tva_rate
 from core.pcg.pcg_service import PlanComptableGeneralService, PCGMappingResult
@@ -33,6 +37,61 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# PNM line separator
+_LINE_END = '\r\n'
+
+# Sage 100 imports PNM files as Windows-1252
+_ENCODING = 'cp1252'
+
+# Export timestamp in PNM headers; its first 10 characters are the DD/MM/YYYY export date
+_EXPORT_TIMESTAMP_FORMAT = '%d/%m/%Y_%H%M%S'
+
+# PNM field delimiter and pipes are replaced with spaces in free text
+_SAGE_TEXT_TRANSLATION = str.maketrans({';': ' ', '|': ' '})
+
+# French decimal separator
+_DECIMAL_COMMA = str.maketrans('.', ',')
+
+# Amounts are rounded half-up to the cent
+_CENT = Decimal('0.01')
+
+
+def _format_french_decimal(value, decimals: int) -> str:
+    """Format a number with a fixed number of decimals and a comma as decimal separator"""
+    return format(value, f'.{decimals}f').translate(_DECIMAL_COMMA)
+
+
+@lru_cache(maxsize=4096)
+def _clean_sage_text(text: str) -> str:
+    """Clean non-empty text for a PNM field, cached since piece numbers and labels repeat across entries"""
+    # Remove semicolons (PNM delimiter), pipes, and control characters
+    cleaned = text.translate(_SAGE_TEXT_TRANSLATION)
+    if '\\' in cleaned:
+        cleaned = cleaned.replace('\\n', ' ').replace('\\r', ' ')
+    
+    # Remove extra whitespace
+    cleaned = ' '.join(cleaned.split())
+    
+    # Truncate to 35 characters for better readability (was 30)
+    cleaned = cleaned[:35]
+    
+    # Ensure French characters are properly handled
+    # This will be encoded as windows-1252 when writing to file
+    return cleaned
+
+
+@lru_cache(maxsize=1024)
+def _compliance_fragment(siren_number: Optional[str], tva_number: Optional[str], is_french_compliant: bool) -> str:
+    """PNM footer compliance tokens, cached since batches repeat the same vendors"""
+    tokens = []
+    if siren_number:
+        tokens.append(f"SIREN:{siren_number}")
+    if tva_number:
+        tokens.append(f"TVA_FOURN:{tva_number}")
+    if is_french_compliant:
+        tokens.append("FR_COMPLIANT")
+    return "_".join(tokens)
+
 
 class FrenchJournalCode(Enum):
     """French standard journal codes"""
@@ -92,6 +151,72 @@ class PlanComptableGeneral:
     PRODUCTION_VENDUE = "701000"
     PRESTATIONS_SERVICES = "706000"
 
+_PCG_ACCOUNT_NAMES = {
+    PlanComptableGeneral.FOURNISSEURS: "Fournisseurs",
+    PlanComptableGeneral.ACHATS_MARCHANDISES: "Achats de marchandises",
+    PlanComptableGeneral.ACHATS_MATIERES_PREMIERES: "Achats de matières premières",
+    PlanComptableGeneral.SERVICES_EXTERIEURS: "Services extérieurs",
+    PlanComptableGeneral.PERSONNEL_EXTERIEURS: "Personnel extérieur",
+    PlanComptableGeneral.TRANSPORTS_BIENS: "Transports de biens",
+    PlanComptableGeneral.PUBLICITE_PUBLICATIONS: "Publicité et publications",
+    PlanComptableGeneral.TELECOMMUNICATIONS: "Télécommunications",
+    PlanComptableGeneral.MATERIEL_INFORMATIQUE: "Matériel informatique",
+    PlanComptableGeneral.TVA_DEDUCTIBLE_BIENS: "TVA déductible sur biens",
+    PlanComptableGeneral.TVA_DEDUCTIBLE_SERVICES: "TVA déductible sur services",
+    PlanComptableGeneral.TVA_DEDUCTIBLE_AUTRE: "TVA déductible autre taux",
+}
+
+# TVA déductible account per rate; other rates default to the standard rate account
+_TVA_DEDUCTIBLE_ACCOUNTS = {
+    20.0: PlanComptableGeneral.TVA_DEDUCTIBLE_BIENS,
+    10.0: PlanComptableGeneral.TVA_DEDUCTIBLE_SERVICES,
+    5.5: PlanComptableGeneral.TVA_DEDUCTIBLE_AUTRE,
+    2.1: PlanComptableGeneral.TVA_DEDUCTIBLE_AUTRE,
+    0.0: PlanComptableGeneral.TVA_DEDUCTIBLE_AUTRE  # For exempt items
+}
+
+# Legacy expense account mapping: keywords matched as substrings, categories
+# checked in priority order as (pattern, account_code, account_name, confidence)
+_EXPENSE_CATEGORIES = (
+    # Services extérieurs (61xxxx)
+    (re.compile('service|prestation|consultation|conseil|formation|'
+                'assistance|maintenance|support|audit|expertise', re.IGNORECASE),
+     PlanComptableGeneral.SERVICES_EXTERIEURS, "Sous-traitance générale", 0.8),
+    # Personnel extérieur (621xxx)
+    (re.compile('interim|freelance|consultant|sous-traitance|mission', re.IGNORECASE),
+     PlanComptableGeneral.PERSONNEL_EXTERIEURS, "Personnel extérieur", 0.8),
+    # Transports (624xxx)
+    (re.compile('transport|livraison|expédition|fret|logistique|'
+                'déplacement|voyage|carburant', re.IGNORECASE),
+     PlanComptableGeneral.TRANSPORTS_BIENS, "Transports sur achats", 0.8),
+    # Télécommunications (626xxx)
+    (re.compile('téléphone|internet|télécommunication|ligne|forfait|'
+                'communication|web|hébergement|domaine', re.IGNORECASE),
+     PlanComptableGeneral.TELECOMMUNICATIONS, "Frais postaux et télécommunications", 0.8),
+    # Publicité (623xxx)
+    (re.compile('publicité|marketing|communication|impression|affichage|'
+                'promotion|advertising|design|graphique', re.IGNORECASE),
+     PlanComptableGeneral.PUBLICITE_PUBLICATIONS, "Publicité et publications", 0.8),
+    # Matériel informatique (218xxx or 606xxx for < 500€)
+    (re.compile('ordinateur|informatique|logiciel|matériel|hardware|'
+                'software|licence|equipement|machine', re.IGNORECASE),
+     PlanComptableGeneral.MATERIEL_INFORMATIQUE, "Matériel informatique", 0.8),
+    # Achats de matières premières
+    (re.compile('matière|matériau|composant|pièce|fourniture|'
+                'approvisionnement|stock|produit', re.IGNORECASE),
+     PlanComptableGeneral.ACHATS_MATIERES_PREMIERES, "Achats de matières premières", 0.8),
+)
+
+@lru_cache(maxsize=4096)
+def _classify_description(description: str) -> Tuple[str, str, float]:
+    """Legacy keyword classification of a line item description, cached since descriptions recur"""
+    for pattern, account_code, account_name, confidence in _EXPENSE_CATEGORIES:
+        if pattern.search(description):
+            return account_code, account_name, confidence
+    
+    # Default to general purchases
+    return PlanComptableGeneral.ACHATS_MARCHANDISES, "Achats de marchandises", 0.3
+
 @dataclass
 class SageValidationResult:
     """Result of Sage PNM validation"""
@@ -128,7 +253,7 @@ class EnhancedSageExporter:
         self.zero_tolerance_errors = True
         
         # Sequential numbering for French compliance
-        self._sequence_counter = 1
+        self._seq = itertools.count(1)
     
     def export_invoice(self, invoice: InvoiceData, validate_before_export: bool = True) -> Tuple[str, SageValidationResult]:
         """
@@ -141,6 +266,39 @@ class EnhancedSageExporter:
         Returns:
             Tuple of (PNM formatted string, validation result)
         """
+        pnm_lines, validation_result = self._export_invoice_lines(invoice, validate_before_export)
+        
+        # Join with proper line endings
+        return _LINE_END.join(pnm_lines), validation_result
+    
+    def export_invoice_bytes(self, invoice: InvoiceData, validate_before_export: bool = True) -> Tuple[bytes, SageValidationResult]:
+        """
+        Export a single invoice to Sage 100 PNM format as Windows-1252 bytes
+        
+        Encoded like export_batch_bytes, so single and batch downloads agree.
+        Characters outside Windows-1252 are replaced.
+        
+        Args:
+            invoice: Invoice data to export
+            validate_before_export: Perform comprehensive validation before export
+            
+        Returns:
+            Tuple of (PNM encoded content, validation result)
+        """
+        pnm_content, validation_result = self.export_invoice(invoice, validate_before_export)
+        return pnm_content.encode(_ENCODING, 'replace'), validation_result
+    
+    def _export_invoice_lines(self, invoice: InvoiceData, validate_before_export: bool,
+                              export_timestamp: Optional[str] = None) -> Tuple[List[str], SageValidationResult]:
+        """
+        Export a single invoice as PNM lines: header, one line per accounting entry, footer
+        
+        export_timestamp is the header timestamp ('%d/%m/%Y_%H%M%S'); batches
+        pass one shared value, otherwise the current time is used.
+        
+        Returns:
+            Tuple of (PNM lines, empty if the export failed, validation result)
+        """
         logger.info(f"Starting Sage 100 PNM export for invoice {invoice.invoice_number}")
         
         # Comprehensive pre-export validation
@@ -150,47 +308,49 @@ class EnhancedSageExporter:
         
         if not validation_result.is_valid and self.zero_tolerance_errors:
             logger.error(f"Invoice {invoice.invoice_number} failed validation: {validation_result.errors}")
-            return "", validation_result
+            return [], validation_result
         
         try:
+            # One clock read per export, shared by the header and any date fallback
+            if export_timestamp is None:
+                export_timestamp = datetime.now().strftime(_EXPORT_TIMESTAMP_FORMAT)
+            
             # Generate accounting entries using French accounting principles
-            accounting_entries = self._generate_accounting_entries(invoice)
+            accounting_entries = self._generate_accounting_entries(invoice, export_timestamp[:10])
             
             # Format entries as Sage 100 PNM
             pnm_lines = []
             
             # PNM Header
-            pnm_header = self._format_pnm_header(invoice, len(accounting_entries))
+            pnm_header = self._format_pnm_header(invoice, len(accounting_entries), export_timestamp)
             pnm_lines.append(pnm_header)
             
-            # Export each accounting entry
-            for entry in accounting_entries:
-                pnm_entry = self._format_accounting_entry_to_pnm(entry, invoice)
+            # Export each accounting entry, checking its amounts as they are formatted
+            entry_warnings = [] if validate_before_export else None
+            for line_number, entry in enumerate(accounting_entries, 1):
+                pnm_entry = self._format_accounting_entry_to_pnm(entry, invoice, line_number, entry_warnings)
                 pnm_lines.append(pnm_entry)
             
             # PNM Footer
             pnm_footer = self._format_pnm_footer(invoice, accounting_entries)
             pnm_lines.append(pnm_footer)
             
-            # Join with proper line endings and encode for French characters
-            pnm_content = '\\r\\n'.join(pnm_lines)
-            
             # Final validation of generated PNM
             if validate_before_export:
-                final_validation = self._validate_generated_pnm(pnm_content, invoice)
+                final_validation = self._validate_generated_pnm(pnm_lines, invoice, entry_warnings)
                 validation_result.errors.extend(final_validation.errors)
                 validation_result.warnings.extend(final_validation.warnings)
                 validation_result.sage_import_ready = final_validation.sage_import_ready
             
             logger.info(f"Successfully exported invoice {invoice.invoice_number} to Sage 100 PNM")
-            return pnm_content, validation_result
+            return pnm_lines, validation_result
             
         except Exception as e:
             logger.error(f"Export failed for invoice {invoice.invoice_number}: {str(e)}")
             validation_result.errors.append(f"Erreur d'export Sage: {str(e)}")
             validation_result.is_valid = False
             validation_result.sage_import_ready = False
-            return "", validation_result
+            return [], validation_result
     
     def export_batch(self, invoices: List[InvoiceData], validate_all: bool = True) -> Tuple[str, List[SageValidationResult]]:
         """
@@ -203,8 +363,47 @@ class EnhancedSageExporter:
         Returns:
             Tuple of (PNM formatted string, list of validation results)
         """
+        out = io.StringIO()
+        all_validation_results = self._write_batch(invoices, out, validate_all)
+        return out.getvalue(), all_validation_results
+    
+    def export_batch_bytes(self, invoices: List[InvoiceData], validate_all: bool = True) -> Tuple[bytes, List[SageValidationResult]]:
+        """
+        Export multiple invoices to Sage 100 PNM format as Windows-1252 bytes
+        
+        Lines are encoded as they are written, so file writers and HTTP
+        responses can use this directly without building the export as a str.
+        Characters outside Windows-1252 are replaced.
+        
+        Args:
+            invoices: List of invoice data to export
+            validate_all: Perform validation on all invoices
+            
+        Returns:
+            Tuple of (PNM encoded content, list of validation results)
+        """
+        buffer = io.BytesIO()
+        out = io.TextIOWrapper(buffer, encoding=_ENCODING, errors='replace', newline='')
+        all_validation_results = self._write_batch(invoices, out, validate_all)
+        out.flush()
+        out.detach()
+        return buffer.getvalue(), all_validation_results
+    
+    def _write_batch(self, invoices: List[InvoiceData], out: TextIO, validate_all: bool) -> List[SageValidationResult]:
+        """
+        Export invoices and write the combined PNM batch to a text stream
+        
+        Lines are written straight to the stream rather than collected in a
+        list and joined; nothing is written if no invoice could be exported.
+        
+        Returns:
+            List of validation results, one per invoice
+        """
         logger.info(f"Starting batch export of {len(invoices)} invoices to Sage 100 PNM")
         
+        # One timestamp for the whole batch rather than a clock read per invoice
+        export_timestamp = datetime.now().strftime(_EXPORT_TIMESTAMP_FORMAT)
+        
         all_validation_results = []
         successful_exports = []
         failed_exports = []
@@ -212,11 +411,11 @@ class EnhancedSageExporter:
         # Export each invoice with individual validation
         for i, invoice in enumerate(invoices):
             try:
-                pnm_content, validation_result = self.export_invoice(invoice, validate_all)
+                pnm_lines, validation_result = self._export_invoice_lines(invoice, validate_all, export_timestamp)
                 all_validation_results.append(validation_result)
                 
                 if validation_result.sage_import_ready:
-                    successful_exports.append((invoice, pnm_content))
+                    successful_exports.append((invoice, pnm_lines))
                 else:
                     failed_exports.append((invoice, validation_result))
                     
@@ -234,31 +433,26 @@ class EnhancedSageExporter:
         
         if not successful_exports:
             logger.error("No invoices successfully exported in batch")
-            return "", all_validation_results
+            return all_validation_results
         
-        # Combine successful exports into single PNM file
-        batch_pnm_lines = []
+        write = out.write
         
-        # Batch header
-        batch_header = self._format_sage_batch_header(len(successful_exports))
-        batch_pnm_lines.append(batch_header)
+        # Combine successful exports into single PNM file, starting with the batch header
+        write(self._format_sage_batch_header(len(successful_exports), export_timestamp[:10]))
         
         # Add all successful invoice exports
-        for invoice, pnm_content in successful_exports:
-            # Remove individual headers/footers and extract entries
-            pnm_lines = pnm_content.split('\\r\\n')
+        for invoice, pnm_lines in successful_exports:
             # Skip the first (header) and last (footer) lines of individual exports
-            if len(pnm_lines) > 2:
-                batch_pnm_lines.extend(pnm_lines[1:-1])
+            for pnm_line in pnm_lines[1:-1]:
+                write(_LINE_END)
+                write(pnm_line)
         
         # Batch footer
-        batch_footer = self._format_sage_batch_footer([inv for inv, _ in successful_exports])
-        batch_pnm_lines.append(batch_footer)
-        
-        batch_content = '\\r\\n'.join(batch_pnm_lines)
+        write(_LINE_END)
+        write(self._format_sage_batch_footer([inv for inv, _ in successful_exports]))
         
         logger.info(f"Batch export completed: {len(successful_exports)} successful, {len(failed_exports)} failed")
-        return batch_content, all_validation_results
+        return all_validation_results
     
     # ==========================================
     # CORE PROFESSIONAL SAGE 100 PNM METHODS
@@ -301,13 +495,16 @@ class EnhancedSageExporter:
         
         # Check for balanced accounting
         if invoice.tva_breakdown:
-            total_ht = sum(item.taxable_amount for item in invoice.tva_breakdown)
-            total_tva = sum(item.tva_amount for item in invoice.tva_breakdown)
-            expected_ttc = total_ht + total_tva
+            total_ht = 0
+            total_tva = 0
+            for item in invoice.tva_breakdown:
+                total_ht += item.taxable_amount
+                total_tva += item.tva_amount
             actual_ttc = invoice.total_ttc or invoice.total or 0
+            ttc_difference = abs(total_ht + total_tva - actual_ttc)
             
-            if abs(expected_ttc - actual_ttc) > 0.02:  # 2 cents tolerance
-                warnings.append(f"Différence de calcul TVA détectée: {abs(expected_ttc - actual_ttc):.2f}€")
+            if ttc_difference > 0.02:  # 2 cents tolerance
+                warnings.append(f"Différence de calcul TVA détectée: {ttc_difference:.2f}€")
         
         # Calculate compliance score
         compliance_score = 100.0
@@ -323,7 +520,7 @@ class EnhancedSageExporter:
             sage_import_ready=len(errors) == 0
         )
     
-    @dataclass
+    @dataclass(slots=True)
     class AccountingEntry:
         """Represents a single accounting entry for Sage"""
         journal_code: str
@@ -338,18 +535,32 @@ class EnhancedSageExporter:
         entry_date: str
         due_date: Optional[str] = None
         sequence_number: Optional[int] = None
+        is_tva: bool = False  # TVA déductible entry, counted apart from HT in the footer
     
-    def _generate_accounting_entries(self, invoice: InvoiceData) -> List['EnhancedSageExporter.AccountingEntry']:
+    def _generate_accounting_entries(self, invoice: InvoiceData, today: Optional[str] = None) -> List['EnhancedSageExporter.AccountingEntry']:
         """
         Generate balanced accounting entries following French accounting principles
         
+        today (DD/MM/YYYY) stands in for missing or unreadable invoice dates.
+        
         Returns:
             List of accounting entries ready for Sage 100 import
         """
-        entries = []
-        entry_date = self._format_sage_date(invoice.date)
-        due_date = self._format_sage_date(invoice.due_date) if invoice.due_date else entry_date
-        piece_number = invoice.invoice_number or f"FACT{self._sequence_counter}"
+        shipping_cost = invoice.shipping_cost or 0
+        packaging_cost = invoice.packaging_cost or 0
+        other_charges = invoice.other_charges or 0
+        
+        # Pre-size the entry list: supplier, one per line item, charges and non-zero TVA rates
+        n_charges = (shipping_cost > 0) + (packaging_cost > 0) + (other_charges > 0)
+        n_tva = sum(1 for tva_item in invoice.tva_breakdown if tva_item.tva_amount > 0)
+        entries = [None] * (1 + len(invoice.line_items) + n_charges + n_tva)
+        k = 0
+        total_debit = 0
+        total_credit = 0
+        entry_date = self._format_sage_date(invoice.date, today)
+        due_date = self._format_sage_date(invoice.due_date, today) if invoice.due_date else entry_date
+        supplier_sequence = next(self._seq)
+        piece_number = invoice.invoice_number or f"FACT{supplier_sequence}"
         
         # 1. SUPPLIER CREDIT ENTRY (Class 4 - Tiers) with complete French business info
         supplier_account = self.pcg.FOURNISSEURS
@@ -369,82 +580,91 @@ class EnhancedSageExporter:
             piece_number=piece_number,
             entry_date=entry_date,
             due_date=due_date,
-            sequence_number=self._sequence_counter
+            sequence_number=supplier_sequence
         )
-        entries.append(supplier_entry)
-        self._sequence_counter += 1
+        entries[k] = supplier_entry
+        k += 1
+        total_debit += supplier_entry.debit_amount
+        total_credit += supplier_entry.credit_amount
         
         # 2. EXPENSE DEBIT ENTRIES (Class 6 - Charges) with intelligent PCG mapping and complete line item info
-        for i, item in enumerate(invoice.line_items):
-            expense_account, expense_name, confidence = self._determine_pcg_expense_account(item.description, item)
-            item_total_ht = item.unit_price * item.quantity
+        expense_accounts = self._determine_pcg_expense_accounts(invoice.line_items)
+        accounting_entry = self.AccountingEntry
+        clean_text = self._clean_sage_text
+        sequence = self._seq
+        journal_code = FrenchJournalCode.ACHATS.value
+        for item, (expense_account, expense_name, confidence) in zip(invoice.line_items, expense_accounts):
+            # Read each pydantic field once per line item
+            description = item.description
+            quantity = item.quantity
+            item_total_ht = item.unit_price * quantity
             
             # Log mapping confidence for monitoring
             if confidence < 0.5:
-                logger.warning(f"Low confidence PCG mapping ({confidence:.2f}) for: {item.description[:30]}")
+                logger.warning(f"Low confidence PCG mapping ({confidence:.2f}) for: {description[:30]}")
             
             # Enhanced description with complete line item information (fix truncation)
             desc_parts = []
-            if item.description:
+            if description:
                 # Keep full description, clean it properly for Sage
-                clean_desc = item.description.replace(';', ' ').replace('|', ' ').strip()
+                clean_desc = description.translate(_SAGE_TEXT_TRANSLATION).strip()
                 desc_parts.append(clean_desc)
             
             # Add quantity for detailed tracking (no extra characters)
-            if item.quantity:
-                desc_parts.append(f"Qté:{item.quantity:.1f}".replace('.', ','))
+            if quantity:
+                desc_parts.append(f"Qté:{_format_french_decimal(quantity, 1)}")
             
             enhanced_description = " ".join(desc_parts)
             
-            expense_entry = self.AccountingEntry(
-                journal_code=FrenchJournalCode.ACHATS.value,
+            expense_entry = accounting_entry(
+                journal_code=journal_code,
                 account_number=expense_account,
                 account_name=expense_name,
                 auxiliary_account="",
                 auxiliary_name="",
                 debit_amount=item_total_ht,
                 credit_amount=0.0,
-                description=self._clean_sage_text(enhanced_description),
+                description=clean_text(enhanced_description),
                 piece_number=piece_number,
                 entry_date=entry_date,
-                sequence_number=self._sequence_counter
+                sequence_number=next(sequence)
             )
-            entries.append(expense_entry)
-            self._sequence_counter += 1
+            entries[k] = expense_entry
+            k += 1
+            # Expense entries are debit-only
+            total_debit += item_total_ht
         
         # 2b. ADDITIONAL CHARGES ENTRIES (new fields)
-        additional_charges = [
-            ("shipping_cost", "Frais de port"),
-            ("packaging_cost", "Frais d'emballage"),
-            ("other_charges", "Autres frais")
-        ]
-        
-        for charge_field, charge_description in additional_charges:
-            charge_amount = getattr(invoice, charge_field, 0) or 0
-            if charge_amount > 0:
-                # Use transport account for shipping, general services for others
-                if charge_field == "shipping_cost":
-                    charge_account = self.pcg.TRANSPORTS_BIENS
-                    charge_account_name = "Transports de biens"
-                else:
-                    charge_account = self.pcg.SERVICES_EXTERIEURS
-                    charge_account_name = "Services extérieurs"
-                
-                charge_entry = self.AccountingEntry(
-                    journal_code=FrenchJournalCode.ACHATS.value,
-                    account_number=charge_account,
-                    account_name=charge_account_name,
-                    auxiliary_account="",
-                    auxiliary_name="",
-                    debit_amount=charge_amount,
-                    credit_amount=0.0,
-                    description=self._clean_sage_text(f"{charge_description} - {invoice.invoice_number}"),
-                    piece_number=piece_number,
-                    entry_date=entry_date,
-                    sequence_number=self._sequence_counter
-                )
-                entries.append(charge_entry)
-                self._sequence_counter += 1
+        # Transport account for shipping, general services for the others
+        if shipping_cost > 0:
+            charge_entry = self._build_charge_entry(
+                shipping_cost, self.pcg.TRANSPORTS_BIENS, "Transports de biens",
+                f"Frais de port - {invoice.invoice_number}", piece_number, entry_date
+            )
+            entries[k] = charge_entry
+            k += 1
+            total_debit += charge_entry.debit_amount
+            total_credit += charge_entry.credit_amount
+        
+        if packaging_cost > 0:
+            charge_entry = self._build_charge_entry(
+                packaging_cost, self.pcg.SERVICES_EXTERIEURS, "Services extérieurs",
+                f"Frais d'emballage - {invoice.invoice_number}", piece_number, entry_date
+            )
+            entries[k] = charge_entry
+            k += 1
+            total_debit += charge_entry.debit_amount
+            total_credit += charge_entry.credit_amount
+        
+        if other_charges > 0:
+            charge_entry = self._build_charge_entry(
+                other_charges, self.pcg.SERVICES_EXTERIEURS, "Services extérieurs",
+                f"Autres frais - {invoice.invoice_number}", piece_number, entry_date
+            )
+            entries[k] = charge_entry
+            k += 1
+            total_debit += charge_entry.debit_amount
+            total_credit += charge_entry.credit_amount
         
         # 3. TVA DEBIT ENTRIES (Class 445 - TVA déductible) with complete breakdown information
         for tva_item in invoice.tva_breakdown:
@@ -453,40 +673,62 @@ class EnhancedSageExporter:
                 tva_name = self._get_pcg_account_name(tva_account)
                 
                 # Clean TVA description with base amount
-                tva_desc_parts = [f"TVA {tva_item.rate:.1f}% déductible".replace('.', ',')]
+                tva_desc_parts = [f"TVA {_format_french_decimal(tva_item.rate, 1)}% déductible"]
                 
                 # Add base amount for auditing
                 if tva_item.taxable_amount:
-                    tva_desc_parts.append(f"Base:{tva_item.taxable_amount:.2f}".replace('.', ','))
+                    tva_desc_parts.append(f"Base:{_format_french_decimal(tva_item.taxable_amount, 2)}")
                 
                 enhanced_tva_description = " ".join(tva_desc_parts)
                 
-                tva_entry = self.AccountingEntry(
-                    journal_code=FrenchJournalCode.ACHATS.value,
+                tva_entry = accounting_entry(
+                    journal_code=journal_code,
                     account_number=tva_account,
                     account_name=tva_name,
                     auxiliary_account="",
                     auxiliary_name="",
                     debit_amount=tva_item.tva_amount,
                     credit_amount=0.0,
-                    description=self._clean_sage_text(enhanced_tva_description),
+                    description=clean_text(enhanced_tva_description),
                     piece_number=piece_number,
                     entry_date=entry_date,
-                    sequence_number=self._sequence_counter
+                    sequence_number=next(sequence),
+                    is_tva=True
                 )
-                entries.append(tva_entry)
-                self._sequence_counter += 1
-        
-        # Validate balanced entries
-        total_debit = sum(entry.debit_amount for entry in entries)
-        total_credit = sum(entry.credit_amount for entry in entries)
+                entries[k] = tva_entry
+                k += 1
+                total_debit += tva_entry.debit_amount
+                total_credit += tva_entry.credit_amount
         
+        # Validate balanced entries, using the totals accumulated above
         if abs(total_debit - total_credit) > 0.01:
             logger.warning(f"Unbalanced entries for invoice {invoice.invoice_number}: "
                          f"Debit {total_debit:.2f} vs Credit {total_credit:.2f}")
         
+        # Drop unused slots if the PCG mapping returned fewer accounts than line items
+        if k < len(entries):
+            del entries[k:]
+        
         return entries
     
+    def _build_charge_entry(self, amount: float, account: str, account_name: str, description: str,
+                            piece_number: str, entry_date: str) -> 'EnhancedSageExporter.AccountingEntry':
+        """Build the debit entry for an additional charge (shipping, packaging, other)"""
+        charge_entry = self.AccountingEntry(
+            journal_code=FrenchJournalCode.ACHATS.value,
+            account_number=account,
+            account_name=account_name,
+            auxiliary_account="",
+            auxiliary_name="",
+            debit_amount=amount,
+            credit_amount=0.0,
+            description=self._clean_sage_text(description),
+            piece_number=piece_number,
+            entry_date=entry_date,
+            sequence_number=next(self._seq)
+        )
+        return charge_entry
+    
     def _determine_pcg_expense_account(self, description: str, line_item: Optional[LineItem] = None) -> Tuple[str, str, float]:
         """
         Intelligent Plan Comptable Général expense account mapping
@@ -509,58 +751,33 @@ class EnhancedSageExporter:
         if not description:
             return self.pcg.ACHATS_MARCHANDISES, "Achats de marchandises", 0.3
         
-        description_lower = description.lower()
-        
-        # Services extérieurs (61xxxx)
-        if any(word in description_lower for word in [
-            'service', 'prestation', 'consultation', 'conseil', 'formation',
-            'assistance', 'maintenance', 'support', 'audit', 'expertise'
-        ]):
-            return self.pcg.SERVICES_EXTERIEURS, "Sous-traitance générale", 0.8
-        
-        # Personnel extérieur (621xxx)
-        if any(word in description_lower for word in [
-            'interim', 'freelance', 'consultant', 'sous-traitance', 'mission'
-        ]):
-            return self.pcg.PERSONNEL_EXTERIEURS, "Personnel extérieur", 0.8
-        
-        # Transports (624xxx)
-        if any(word in description_lower for word in [
-            'transport', 'livraison', 'expédition', 'fret', 'logistique',
-            'déplacement', 'voyage', 'carburant'
-        ]):
-            return self.pcg.TRANSPORTS_BIENS, "Transports sur achats", 0.8
-        
-        # Télécommunications (626xxx)
-        if any(word in description_lower for word in [
-            'téléphone', 'internet', 'télécommunication', 'ligne', 'forfait',
-            'communication', 'web', 'hébergement', 'domaine'
-        ]):
-            return self.pcg.TELECOMMUNICATIONS, "Frais postaux et télécommunications", 0.8
-        
-        # Publicité (623xxx)
-        if any(word in description_lower for word in [
-            'publicité', 'marketing', 'communication', 'impression', 'affichage',
-            'promotion', 'advertising', 'design', 'graphique'
-        ]):
-            return self.pcg.PUBLICITE_PUBLICATIONS, "Publicité et publications", 0.8
-        
-        # Matériel informatique (218xxx or 606xxx for < 500€)
-        if any(word in description_lower for word in [
-            'ordinateur', 'informatique', 'logiciel', 'matériel', 'hardware',
-            'software', 'licence', 'equipement', 'machine'
-        ]):
-            return self.pcg.MATERIEL_INFORMATIQUE, "Matériel informatique", 0.8
-        
-        # Achats de matières premières
-        if any(word in description_lower for word in [
-            'matière', 'matériau', 'composant', 'pièce', 'fourniture',
-            'approvisionnement', 'stock', 'produit'
-        ]):
-            return self.pcg.ACHATS_MATIERES_PREMIERES, "Achats de matières premières", 0.8
-        
-        # Default to general purchases
-        return self.pcg.ACHATS_MARCHANDISES, "Achats de marchandises", 0.3
+        return _classify_description(description)
+    
+    def _determine_pcg_expense_accounts(self, line_items: List[LineItem]) -> List[Tuple[str, str, float]]:
+        """
+        Map all line items of an invoice with a single PCG service call
+        If the batch call fails, items are mapped one by one so only the
+        items the service cannot map fall back to the legacy mapping
+        
+        Returns:
+            List of (account_code, account_name, confidence_score), one per line item
+        """
+        if self.pcg_service and line_items:
+            try:
+                mapping_results = self.pcg_service.map_line_items_batch(line_items, use_ai=True)
+                accounts = []
+                for item, mapping_result in zip(line_items, mapping_results):
+                    logger.info(f"PCG Service mapping: {mapping_result.account_code} "
+                               f"({mapping_result.confidence_score:.2f}) for '{item.description[:30]}'")
+                    accounts.append((mapping_result.account_code, mapping_result.account_name,
+                                     mapping_result.confidence_score))
+                return accounts
+            except Exception as e:
+                logger.warning(f"PCG service batch mapping failed, mapping items one by one: {e}")
+                return [self._determine_pcg_expense_account(item.description, item) for item in line_items]
+        
+        # Legacy mapping only, since the service is unavailable
+        return [self._determine_pcg_expense_account(item.description) for item in line_items]
     
     def _get_pcg_tva_deductible_account(self, tva_rate: float) -> str:
         """
@@ -575,35 +792,11 @@ class EnhancedSageExporter:
                 logger.warning(f"PCG service TVA mapping failed, using fallback: {e}")
         
         # Fallback to legacy hardcoded mapping
-        if tva_rate == 20.0:
-            return self.pcg.TVA_DEDUCTIBLE_BIENS
-        elif tva_rate == 10.0:
-            return self.pcg.TVA_DEDUCTIBLE_SERVICES
-        elif tva_rate in [5.5, 2.1]:
-            return self.pcg.TVA_DEDUCTIBLE_AUTRE
-        elif tva_rate == 0.0:
-            return self.pcg.TVA_DEDUCTIBLE_AUTRE  # For exempt items
-        else:
-            # Default to standard rate account
-            return self.pcg.TVA_DEDUCTIBLE_BIENS
+        return _TVA_DEDUCTIBLE_ACCOUNTS.get(tva_rate, self.pcg.TVA_DEDUCTIBLE_BIENS)
     
     def _get_pcg_account_name(self, account_code: str) -> str:
         """Get French account name from PCG code"""
-        account_names = {
-            self.pcg.FOURNISSEURS: "Fournisseurs",
-            self.pcg.ACHATS_MARCHANDISES: "Achats de marchandises",
-            self.pcg.ACHATS_MATIERES_PREMIERES: "Achats de matières premières",
-            self.pcg.SERVICES_EXTERIEURS: "Services extérieurs",
-            self.pcg.PERSONNEL_EXTERIEURS: "Personnel extérieur",
-            self.pcg.TRANSPORTS_BIENS: "Transports de biens",
-            self.pcg.PUBLICITE_PUBLICATIONS: "Publicité et publications",
-            self.pcg.TELECOMMUNICATIONS: "Télécommunications",
-            self.pcg.MATERIEL_INFORMATIQUE: "Matériel informatique",
-            self.pcg.TVA_DEDUCTIBLE_BIENS: "TVA déductible sur biens",
-            self.pcg.TVA_DEDUCTIBLE_SERVICES: "TVA déductible sur services",
-            self.pcg.TVA_DEDUCTIBLE_AUTRE: "TVA déductible autre taux",
-        }
-        return account_names.get(account_code, "Compte")
+        return _PCG_ACCOUNT_NAMES.get(account_code, "Compte")
     
     def _generate_supplier_auxiliary_account(self, vendor: Optional[FrenchBusinessInfo]) -> str:
         """Generate auxiliary account code for supplier with complete French business info"""
@@ -666,10 +859,11 @@ class EnhancedSageExporter:
     # SAGE 100 PNM FORMATTING METHODS
     # ==========================================
     
-    def _format_pnm_header(self, invoice: InvoiceData, entry_count: int) -> str:
+    def _format_pnm_header(self, invoice: InvoiceData, entry_count: int, export_timestamp: Optional[str] = None) -> str:
         """Format enhanced Sage 100 PNM file header with French business compliance"""
         # Enhanced header with additional French compliance metadata
-        export_timestamp = datetime.now().strftime('%d/%m/%Y_%H%M%S')
+        if export_timestamp is None:
+            export_timestamp = datetime.now().strftime(_EXPORT_TIMESTAMP_FORMAT)
         vendor_ref = ""
         
         # Add vendor SIREN for French traceability
@@ -679,98 +873,120 @@ class EnhancedSageExporter:
         # Add invoice reference for tracking
         invoice_ref = invoice.invoice_number or "SANS_NUM"
         
-        return f"SAGE;100;PNM;{self._format_sage_date(datetime.now().date())};{entry_count};INVOICE_AI_EXPORT_FR_{invoice_ref}{vendor_ref}_{export_timestamp}"
+        # The timestamp starts with the export date (DD/MM/YYYY)
+        return f"SAGE;100;PNM;{export_timestamp[:10]};{entry_count};INVOICE_AI_EXPORT_FR_{invoice_ref}{vendor_ref}_{export_timestamp}"
     
     def _format_pnm_footer(self, invoice: InvoiceData, entries: List['EnhancedSageExporter.AccountingEntry']) -> str:
         """Format enhanced Sage 100 PNM file footer with comprehensive control totals and French compliance"""
-        total_debit = sum(entry.debit_amount for entry in entries)
-        total_credit = sum(entry.credit_amount for entry in entries)
-        
-        # Calculate additional control totals for French compliance
-        total_tva = sum(entry.debit_amount for entry in entries if "TVA" in entry.description)
-        total_ht = sum(entry.debit_amount for entry in entries if "TVA" not in entry.description and entry.debit_amount > 0)
+        # Control totals, plus the HT/TVA split for French compliance, in one pass
+        total_debit = 0
+        total_credit = 0
+        total_tva = 0
+        total_ht = 0
+        for entry in entries:
+            debit_amount = entry.debit_amount
+            total_debit += debit_amount
+            total_credit += entry.credit_amount
+            if entry.is_tva:
+                total_tva += debit_amount
+            elif debit_amount > 0:
+                total_ht += debit_amount
+        
+        fmt = self._format_sage_amount
+        vendor = invoice.vendor
+        
+        # Enhanced footer with French compliance metadata, then payment and business context
+        compliance = _compliance_fragment(
+            vendor.siren_number if vendor else None,
+            vendor.tva_number if vendor else None,
+            bool(invoice.is_french_compliant)
+        )
+        all_info = [compliance] if compliance else []
+        
+        payment_method = invoice.payment_method
+        if payment_method:
+            all_info.append(f"PAY:{payment_method[:8]}")
+        order_number = invoice.order_number
+        if order_number:
+            all_info.append(f"CMD:{order_number[:8]}")
+        discount_amount = invoice.discount_amount
+        if discount_amount and discount_amount > 0:
+            all_info.append(f"REM:{fmt(discount_amount)}")
+        deposit_amount = invoice.deposit_amount
+        if deposit_amount and deposit_amount > 0:
+            all_info.append(f"ACC:{fmt(deposit_amount)}")
         
-        # Enhanced footer with French compliance metadata and new fields
-        compliance_info = []
-        if invoice.vendor and invoice.vendor.siren_number:
-            compliance_info.append(f"SIREN:{invoice.vendor.siren_number}")
-        if invoice.vendor and invoice.vendor.tva_number:
-            compliance_info.append(f"TVA_FOURN:{invoice.vendor.tva_number}")
-        if invoice.is_french_compliant:
-            compliance_info.append("FR_COMPLIANT")
-        
-        # Add payment and business context information
-        additional_info = []
-        if hasattr(invoice, 'payment_method') and invoice.payment_method:
-            additional_info.append(f"PAY:{invoice.payment_method[:8]}")
-        if hasattr(invoice, 'order_number') and invoice.order_number:
-            additional_info.append(f"CMD:{invoice.order_number[:8]}")
-        if hasattr(invoice, 'discount_amount') and invoice.discount_amount and invoice.discount_amount > 0:
-            additional_info.append(f"REM:{self._format_sage_amount(invoice.discount_amount)}")
-        if hasattr(invoice, 'deposit_amount') and invoice.deposit_amount and invoice.deposit_amount > 0:
-            additional_info.append(f"ACC:{self._format_sage_amount(invoice.deposit_amount)}")
-        
-        # Combine all metadata
-        all_info = compliance_info + additional_info
         info_str = "_".join(all_info) if all_info else "STANDARD"
         
-        return f"TOTAL;{len(entries)};{self._format_sage_amount(total_debit)};{self._format_sage_amount(total_credit)};HT:{self._format_sage_amount(total_ht)};TVA:{self._format_sage_amount(total_tva)};{info_str}"
+        return f"TOTAL;{len(entries)};{fmt(total_debit)};{fmt(total_credit)};HT:{fmt(total_ht)};TVA:{fmt(total_tva)};{info_str}"
     
-    def _format_accounting_entry_to_pnm(self, entry: 'EnhancedSageExporter.AccountingEntry', invoice: InvoiceData) -> str:
+    def _format_accounting_entry_to_pnm(self, entry: 'EnhancedSageExporter.AccountingEntry', invoice: InvoiceData,
+                                        line_number: int = 0, warnings: Optional[List[str]] = None) -> str:
         """
         Format accounting entry to Sage 100 PNM line format
         
         Sage PNM format: Journal;Date;Piece;Account;Auxiliary;Debit;Credit;Description;DueDate;Sequence
+        
+        When a warnings list is given, debit and credit amounts not in French
+        decimal format are reported to it under line_number.
         """
-        pnm_fields = [
-            entry.journal_code,                                    # Journal code
-            entry.entry_date,                                      # Entry date
-            self._clean_sage_text(entry.piece_number),            # Piece number
-            entry.account_number,                                  # Account number
-            entry.auxiliary_account,                               # Auxiliary account
-            self._format_sage_amount(entry.debit_amount),         # Debit amount
-            self._format_sage_amount(entry.credit_amount),        # Credit amount
-            self._clean_sage_text(entry.description),             # Description
-            entry.due_date or entry.entry_date,                   # Due date
-            str(entry.sequence_number or 0)                       # Sequence number
-        ]
-        return ';'.join(pnm_fields)
-    
-    def _format_sage_batch_header(self, invoice_count: int) -> str:
-        """Format batch header for multiple invoices"""
-        return f"BATCH_START;{self._format_sage_date(datetime.now().date())};{invoice_count};SAGE_100_IMPORT"
+        clean_text = self._clean_sage_text
+        format_amount = self._format_sage_amount
+        debit = format_amount(entry.debit_amount)
+        credit = format_amount(entry.credit_amount)
+        
+        if warnings is not None:
+            for amount in (debit, credit):
+                if amount and amount != "0,00" and ',' not in amount:
+                    warnings.append(f"Ligne {line_number}: format décimal français attendu (virgule)")
+        
+        return (
+            f"{entry.journal_code};"                              # Journal code
+            f"{entry.entry_date};"                                # Entry date
+            f"{clean_text(entry.piece_number)};"                  # Piece number
+            f"{entry.account_number};"                            # Account number
+            f"{entry.auxiliary_account};"                         # Auxiliary account
+            f"{debit};"                                           # Debit amount
+            f"{credit};"                                          # Credit amount
+            f"{clean_text(entry.description)};"                   # Description
+            f"{entry.due_date or entry.entry_date};"              # Due date
+            f"{entry.sequence_number or 0}"                       # Sequence number
+        )
+    
+    def _format_sage_batch_header(self, invoice_count: int, export_date: Optional[str] = None) -> str:
+        """Format batch header for multiple invoices, dated export_date (DD/MM/YYYY) or today"""
+        export_date = export_date or datetime.now().strftime('%d/%m/%Y')
+        return f"BATCH_START;{export_date};{invoice_count};SAGE_100_IMPORT"
     
     def _format_sage_batch_footer(self, invoices: List[InvoiceData]) -> str:
         """Format batch footer with summary totals"""
-        total_ht = sum(inv.subtotal_ht or inv.subtotal or 0 for inv in invoices)
-        total_tva = sum(inv.total_tva or inv.tax or 0 for inv in invoices)
-        total_ttc = sum(inv.total_ttc or inv.total or 0 for inv in invoices)
-        
-        return f"BATCH_END;{len(invoices)};{self._format_sage_amount(total_ht)};{self._format_sage_amount(total_tva)};{self._format_sage_amount(total_ttc)}"
+        total_ht = 0
+        total_tva = 0
+        total_ttc = 0
+        for inv in invoices:
+            total_ht += inv.subtotal_ht or inv.subtotal or 0
+            total_tva += inv.total_tva or inv.tax or 0
+            total_ttc += inv.total_ttc or inv.total or 0
+        
+        fmt = self._format_sage_amount
+        return f"BATCH_END;{len(invoices)};{fmt(total_ht)};{fmt(total_tva)};{fmt(total_ttc)}"
     
     # ==========================================
     # FORMATTING UTILITY METHODS
     # ==========================================
     
-    def _format_sage_date(self, date_input) -> str:
-        """Format date for Sage 100 (DD/MM/YYYY)"""
+    def _format_sage_date(self, date_input, today: Optional[str] = None) -> str:
+        """Format date for Sage 100 (DD/MM/YYYY), falling back to today or the current date"""
         if not date_input:
-            return datetime.now().strftime('%d/%m/%Y')
+            return today or datetime.now().strftime('%d/%m/%Y')
         
         if isinstance(date_input, str):
-            try:
-                # Try ISO format first
-                date_obj = datetime.strptime(date_input, '%Y-%m-%d').date()
-            except ValueError:
-                try:
-                    # Try French format
-                    date_obj = datetime.strptime(date_input, '%d/%m/%Y').date()
-                except ValueError:
-                    return datetime.now().strftime('%d/%m/%Y')
-        else:
-            date_obj = date_input
+            # ISO format first, then French format
+            date_input = parse_date_string(date_input)
+            if date_input is None:
+                return today or datetime.now().strftime('%d/%m/%Y')
         
-        return date_obj.strftime('%d/%m/%Y')
+        return date_input.strftime('%d/%m/%Y')
     
     def _format_sage_amount(self, amount) -> str:
         """Format amount for Sage 100 (French decimal format with comma)"""
@@ -784,11 +1000,20 @@ class EnhancedSageExporter:
             except ValueError:
                 return "0,00"
         
+        # Ints and floats written with at most two decimals need no rounding:
+        # pad their repr instead of going through Decimal
+        amount_type = type(amount)
+        if amount_type is float or amount_type is int:
+            text = repr(amount)
+            whole, _, fraction = text.partition('.')
+            if len(fraction) <= 2 and whole.lstrip('-').isdigit():
+                return f"{whole},{fraction:0<2}"
+        
         # Use Decimal for precise formatting
-        decimal_amount = Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        decimal_amount = Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP)
         
         # Format with French decimal separator (comma) and no thousands separator
-        formatted = f"{decimal_amount:.2f}".replace('.', ',')
+        formatted = _format_french_decimal(decimal_amount, 2)
         return formatted
     
     def _clean_sage_text(self, text: str) -> str:
@@ -799,27 +1024,19 @@ class EnhancedSageExporter:
         if not text:
             return ""
         
-        # Remove semicolons (PNM delimiter), pipes, and control characters
-        cleaned = text.replace(';', ' ').replace('|', ' ').replace('\\n', ' ').replace('\\r', ' ')
-        
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        
-        # Truncate to 35 characters for better readability (was 30)
-        cleaned = cleaned[:35]
-        
-        # Ensure French characters are properly handled
-        # This will be encoded as windows-1252 when writing to file
-        return cleaned
+        return _clean_sage_text(text)
     
-    def _validate_generated_pnm(self, pnm_content: str, invoice: InvoiceData) -> SageValidationResult:
+    def _validate_generated_pnm(self, lines: List[str], invoice: InvoiceData,
+                                entry_warnings: List[str]) -> SageValidationResult:
         """
-        Final validation of generated PNM content for Sage 100 import readiness
+        Final validation of generated PNM lines for Sage 100 import readiness
+        
+        Entry amounts were checked as they were formatted, giving
+        entry_warnings; entry lines are only checked for their field count,
+        which catches a stray separator left in free text.
         """
         errors = []
-        warnings = []
-        
-        lines = pnm_content.split('\\r\\n')
+        warnings = list(entry_warnings)
         
         # Basic structure validation
         if len(lines) < 3:  # At minimum: header, entry, footer
@@ -831,17 +1048,11 @@ class EnhancedSageExporter:
         
         # Entry validation
         for i, line in enumerate(lines[1:-1], 1):
-            fields = line.split(';')
-            if len(fields) < 10:
-                errors.append(f"Ligne {i}: nombre de champs insuffisant ({len(fields)}/10)")
-            
-            # Validate amounts format
-            for amount_field in [5, 6]:  # Debit and Credit fields
-                if amount_field < len(fields):
-                    amount = fields[amount_field]
-                    if amount and amount != "0,00":
-                        if ',' not in amount:
-                            warnings.append(f"Ligne {i}: format décimal français attendu (virgule)")
+            field_count = line.count(';') + 1
+            if field_count < 10:
+                errors.append(f"Ligne {i}: nombre de champs insuffisant ({field_count}/10)")
+            elif field_count > 10:
+                errors.append(f"Ligne {i}: nombre de champs excessif ({field_count}/10)")
         
         # Footer validation
         if not lines[-1].startswith('TOTAL'):
@@ -942,10 +1153,20 @@ def export_to_sage_pnm(invoice: InvoiceData) -> str:
     pnm_content, _ = export_to_sage_pnm_professional(invoice, validate=False)
     return pnm_content
 
+def export_to_sage_pnm_bytes(invoice: InvoiceData) -> bytes:
+    """Unvalidated single invoice export returning only the Windows-1252 encoded PNM content"""
+    pnm_content, _ = EnhancedSageExporter().export_invoice_bytes(invoice, validate_before_export=False)
+    return pnm_content
+
 def export_batch_to_sage_pnm(invoices: List[InvoiceData]) -> str:
     """Legacy compatibility function - returns only PNM content"""
     pnm_content, _ = export_batch_to_sage_pnm_professional(invoices, validate_all=False)
     return pnm_content
 
+def export_batch_to_sage_pnm_bytes(invoices: List[InvoiceData]) -> bytes:
+    """Unvalidated batch export returning only the Windows-1252 encoded PNM content"""
+    pnm_content, _ = EnhancedSageExporter().export_batch_bytes(invoices, validate_all=False)
+    return pnm_content
+
 # Backward compatibility alias
 SageExporter = EnhancedSageExporter
\ No newline at end of file
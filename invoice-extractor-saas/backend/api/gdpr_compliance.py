@@ -4,13 +4,24 @@ Provides API endpoints for GDPR compliance operations including
 client onboarding, data subject rights, and compliance reporting
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+import asyncio
+import hashlib
+import json
+import os
+import time
 import uuid
 
-from core.database import get_db
+from core.database import get_db, async_session_maker
+from core.gdpr_audit import gdpr_audit
+from core.gdpr_encryption import gdpr_encryption
+from core.gdpr_transfer_compliance import TransferContext, gdpr_transfer_compliance
 from models.gdpr_models import (
     DataSubject, ConsentRecord, RetentionPolicy, 
     AuditLog, BreachIncident, TransferRiskAssessment
@@ -26,6 +37,22 @@ from crud.invoice import get_user_invoices
 
 router = APIRouter(prefix="/gdpr", tags=["GDPR Compliance"])
 
+# Compliance component checks are polled by the dashboard but only change
+# when policies or consents are written, so results are kept briefly.
+_COMPLIANCE_CHECK_TTL_SECONDS = 60
+_compliance_check_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_COMPLIANCE_STATUS_CACHE_CONTROL = f"private, max-age={_COMPLIANCE_CHECK_TTL_SECONDS}, must-revalidate"
+# Component fields that change on every check without a change in status
+_COMPLIANCE_VOLATILE_FIELDS = frozenset({"last_review"})
+_COMPLIANCE_COMPONENTS = (
+    "data_processing_agreements",
+    "retention_policies",
+    "transfer_assessments",
+    "audit_logging",
+    "breach_procedures",
+    "data_subject_rights"
+)
+
 
 # Pydantic Models for API
 class ClientOnboardingRequest(BaseModel):
@@ -79,34 +106,37 @@ async def onboard_client(
     """
     try:
         # Create client onboarding record
+        now = datetime.utcnow()
         onboarding_id = str(uuid.uuid4())
         
         # Assess data processing requirements
         processing_assessment = await _assess_processing_requirements(request, db)
         
         # Create Data Processing Agreement template
-        dpa_template = await _generate_dpa_template(request, processing_assessment)
+        dpa_template = await _generate_dpa_template(request, processing_assessment, now)
         
         # Create retention policies
         retention_policies = await _create_retention_policies(
             request.retention_requirements, 
             request.data_categories,
+            now,
             db
         )
+        _invalidate_compliance_checks()
         
         # Assess transfer requirements
-        if "ai_processing" in request.processing_purposes:
+        if processing_assessment["transfer_assessment_required"]:
             transfer_assessment = await _assess_transfer_requirements(request, db)
         else:
             transfer_assessment = None
         
-        # Log onboarding activity
-        await gdpr_audit.log_data_access(
+        # Log onboarding activity once the response is sent
+        background_tasks.add_task(
+            gdpr_audit.log_data_access,
             user_id=str(current_user.id),
             purpose="client_onboarding",
             legal_basis="contract_performance",
-            data_categories=["identifying_data", "contact_data"],
-            db=db
+            data_categories=["identifying_data", "contact_data"]
         )
         
         # Schedule follow-up tasks
@@ -140,12 +170,19 @@ async def handle_data_subject_rights(
     request: DataSubjectRightsRequest,
     req: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Handle data subject rights requests (GDPR Articles 15-22)
     """
     try:
+        rights_handler = _RIGHTS_HANDLERS.get(request.request_type)
+        if rights_handler is None:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported request type: {request.request_type}"
+            )
+        
         # Verify data subject identity
         data_subject = await _verify_data_subject_identity(
             request.data_subject_email,
@@ -160,37 +197,17 @@ async def handle_data_subject_rights(
             )
         
         # Process the specific rights request
-        if request.request_type == "access":
-            response_data = await _handle_access_request(data_subject, db)
-        elif request.request_type == "rectification":
-            response_data = await _handle_rectification_request(
-                data_subject, 
-                request.specific_requests, 
-                db
-            )
-        elif request.request_type == "erasure":
-            response_data = await _handle_erasure_request(data_subject, db)
-        elif request.request_type == "portability":
-            response_data = await _handle_portability_request(data_subject, db)
-        elif request.request_type == "restriction":
-            response_data = await _handle_restriction_request(data_subject, db)
-        elif request.request_type == "objection":
-            response_data = await _handle_objection_request(data_subject, db)
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported request type: {request.request_type}"
-            )
+        response_data = await rights_handler(data_subject, request, db)
         
-        # Log the rights request
-        await gdpr_audit.log_data_access(
+        # Log the rights request, committed together with any change it made
+        db.add(gdpr_audit.build_data_access_event(
             user_id=str(current_user.id),
             data_subject_id=str(data_subject.id),
             purpose=f"data_subject_rights_{request.request_type}",
             legal_basis="data_subject_rights",
-            request=req,
-            db=db
-        )
+            request=req
+        ))
+        await db.commit()
         
         return {
             "request_id": str(uuid.uuid4()),
@@ -209,13 +226,14 @@ async def manage_consent(
     request: ConsentManagementRequest,
     req: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Manage consent records for data subjects
     """
     try:
         # Create or update consent record
+        now = datetime.utcnow()
         consent_record = ConsentRecord(
             id=uuid.uuid4(),
             data_subject_id=uuid.UUID(request.data_subject_id),
@@ -223,31 +241,31 @@ async def manage_consent(
             consent_mechanism=request.consent_mechanism,
             consent_text=request.consent_text,
             is_active=request.consent_given,
-            consent_given_date=datetime.utcnow() if request.consent_given else None,
-            consent_withdrawn_date=None if request.consent_given else datetime.utcnow(),
+            consent_given_date=now if request.consent_given else None,
+            consent_withdrawn_date=None if request.consent_given else now,
             ip_address=req.client.host if req.client else None,
             user_agent=req.headers.get("user-agent"),
             consent_evidence={
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": now.isoformat(),
                 "method": request.consent_mechanism,
                 "purposes": request.consent_purposes
             }
         )
         
-        db.add(consent_record)
-        db.commit()
-        
-        # Log consent event
-        await gdpr_audit.log_consent_event(
+        # Log consent event in the same transaction as the consent record
+        consent_event = gdpr_audit.build_consent_event(
             data_subject_id=request.data_subject_id,
             consent_given=request.consent_given,
             consent_purposes=request.consent_purposes,
             consent_mechanism=request.consent_mechanism,
             user_id=str(current_user.id),
-            request=req,
-            db=db
+            request=req
         )
         
+        db.add_all([consent_record, consent_event])
+        await db.commit()
+        _invalidate_compliance_checks()
+        
         return {
             "consent_record_id": str(consent_record.id),
             "status": "consent_given" if request.consent_given else "consent_withdrawn",
@@ -262,23 +280,25 @@ async def manage_consent(
 @router.post("/breach/report")
 async def report_breach(
     request: BreachReportRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Report a data breach incident
     """
     try:
         # Create breach incident record
-        incident_reference = f"BREACH-{datetime.utcnow().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
+        now = datetime.utcnow()
+        incident_reference = f"BREACH-{now.strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
         
         breach_incident = BreachIncident(
             id=uuid.uuid4(),
             incident_reference=incident_reference,
             severity_level=request.severity,
             breach_type=request.breach_type,
-            discovery_date=datetime.utcnow(),
-            occurrence_date=request.occurrence_date or datetime.utcnow(),
+            discovery_date=now,
+            occurrence_date=request.occurrence_date or now,
             affected_data_categories=request.affected_data_categories,
             estimated_affected_subjects=request.estimated_affected_subjects,
             likelihood_of_harm="medium",  # Default, will be assessed
@@ -289,17 +309,17 @@ async def report_breach(
         )
         
         db.add(breach_incident)
-        db.commit()
+        await db.commit()
         
         # Log breach detection
-        await gdpr_audit.log_breach_detected(
+        background_tasks.add_task(
+            gdpr_audit.log_breach_detected,
             breach_type=request.breach_type,
             severity=request.severity,
             affected_data_categories=request.affected_data_categories,
             estimated_affected_subjects=request.estimated_affected_subjects,
             discovery_details={"description": request.description},
-            user_id=str(current_user.id),
-            db=db
+            user_id=str(current_user.id)
         )
         
         # Determine notification requirements
@@ -325,6 +345,7 @@ async def report_breach(
 
 @router.get("/audit/trail")
 async def get_audit_trail(
+    background_tasks: BackgroundTasks,
     data_subject_id: Optional[str] = None,
     invoice_id: Optional[str] = None,
     user_id: Optional[str] = None,
@@ -332,7 +353,7 @@ async def get_audit_trail(
     end_date: Optional[datetime] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve audit trail for compliance reporting
@@ -345,67 +366,94 @@ async def get_audit_trail(
                 detail="Insufficient permissions to access audit trail"
             )
         
-        # Retrieve audit trail
-        audit_records = await gdpr_audit.get_audit_trail(
+        # Reject malformed ids now rather than after the response has started
+        for name, value in (("data_subject_id", data_subject_id), ("invoice_id", invoice_id), ("user_id", user_id)):
+            if value:
+                try:
+                    uuid.UUID(value)
+                except ValueError:
+                    raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+        
+        # Stream the audit trail instead of buffering every record
+        audit_records = gdpr_audit.stream_audit_trail(
+            db,
             data_subject_id=data_subject_id,
             invoice_id=invoice_id,
             user_id=user_id,
             start_date=start_date,
             end_date=end_date,
-            limit=limit,
-            db=db
+            limit=limit
         )
         
+        # Run the query and read the first record before responding, so a
+        # database error is still reported as an error status
+        first_record = await anext(audit_records, None)
+        
         # Log audit trail access
-        await gdpr_audit.log_data_access(
+        background_tasks.add_task(
+            gdpr_audit.log_data_access,
             user_id=str(current_user.id),
             purpose="audit_trail_access",
             legal_basis="compliance_obligation",
-            data_categories=["audit_data"],
-            db=db
+            data_categories=["audit_data"]
         )
         
-        return {
-            "audit_records": audit_records,
-            "total_records": len(audit_records),
-            "query_parameters": {
-                "data_subject_id": data_subject_id,
-                "invoice_id": invoice_id,
-                "user_id": user_id,
-                "date_range": {
-                    "start": start_date.isoformat() if start_date else None,
-                    "end": end_date.isoformat() if end_date else None
-                }
+        query_parameters = {
+            "data_subject_id": data_subject_id,
+            "invoice_id": invoice_id,
+            "user_id": user_id,
+            "date_range": {
+                "start": start_date.isoformat() if start_date else None,
+                "end": end_date.isoformat() if end_date else None
             }
         }
         
+        return StreamingResponse(
+            _stream_audit_trail_json(first_record, audit_records, query_parameters),
+            media_type="application/json"
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Audit trail retrieval failed: {str(e)}")
 
 
 @router.get("/compliance/status")
 async def get_compliance_status(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    req: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
 ):
     """
     Get overall GDPR compliance status
     """
     try:
-        # Check various compliance aspects
+        # Check various compliance aspects concurrently
+        component_results = await asyncio.gather(
+            _check_dpa_status(),
+            _check_retention_compliance(),
+            _check_transfer_compliance(),
+            _check_audit_compliance(),
+            _check_breach_compliance(),
+            _check_rights_compliance()
+        )
+        
+        # The ETag covers the component statuses but none of the timestamps,
+        # so it is a weak validator of a body whose timestamps always change
+        etag = _compliance_status_etag(component_results)
+        cache_headers = {"ETag": etag, "Cache-Control": _COMPLIANCE_STATUS_CACHE_CONTROL}
+        if etag[2:] in (tag.strip().removeprefix("W/") for tag in req.headers.get("if-none-match", "").split(",")):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+        
+        now = datetime.utcnow()
         compliance_status = {
             "overall_status": "compliant",
-            "last_assessment_date": datetime.utcnow().isoformat(),
-            "components": {
-                "data_processing_agreements": await _check_dpa_status(db),
-                "retention_policies": await _check_retention_compliance(db),
-                "transfer_assessments": await _check_transfer_compliance(db),
-                "audit_logging": await _check_audit_compliance(db),
-                "breach_procedures": await _check_breach_compliance(db),
-                "data_subject_rights": await _check_rights_compliance(db)
-            },
+            "last_assessment_date": now.isoformat(),
+            "components": dict(zip(_COMPLIANCE_COMPONENTS, component_results)),
             "recommendations": [],
-            "next_review_date": (datetime.utcnow() + timedelta(days=90)).isoformat()
+            "next_review_date": (now + timedelta(days=90)).isoformat()
         }
         
         # Generate recommendations based on status
@@ -423,20 +471,28 @@ async def get_compliance_status(
 # Helper functions
 async def _assess_processing_requirements(
     request: ClientOnboardingRequest, 
-    db: Session
+    db: AsyncSession
 ) -> Dict[str, Any]:
     """Assess client's data processing requirements"""
-    return {
-        "legal_basis_required": "legitimate_interest" if "ai_processing" in request.processing_purposes else "contract",
-        "dpia_required": "ai_processing" in request.processing_purposes,
-        "transfer_assessment_required": "ai_processing" in request.processing_purposes,
-        "high_risk_processing": "ai_processing" in request.processing_purposes
-    }
+    return dict(_processing_requirements(frozenset(request.processing_purposes)))
+
+
+@lru_cache(maxsize=64)
+def _processing_requirements(processing_purposes: frozenset) -> Tuple[Tuple[str, Any], ...]:
+    """Processing requirements for a set of purposes, memoized since it is pure"""
+    has_ai = "ai_processing" in processing_purposes
+    return (
+        ("legal_basis_required", "legitimate_interest" if has_ai else "contract"),
+        ("dpia_required", has_ai),
+        ("transfer_assessment_required", has_ai),
+        ("high_risk_processing", has_ai)
+    )
 
 
 async def _generate_dpa_template(
     request: ClientOnboardingRequest, 
-    assessment: Dict[str, Any]
+    assessment: Dict[str, Any],
+    now: datetime
 ) -> Dict[str, Any]:
     """Generate customized DPA template"""
     return {
@@ -446,44 +502,51 @@ async def _generate_dpa_template(
         "data_categories": request.data_categories,
         "legal_basis": assessment["legal_basis_required"],
         "requires_signatures": True,
-        "effective_date": datetime.utcnow() + timedelta(days=7)
+        "effective_date": now + timedelta(days=7)
     }
 
 
 async def _create_retention_policies(
     retention_requirements: Dict[str, int],
     data_categories: List[str],
-    db: Session
+    now: datetime,
+    db: AsyncSession
 ) -> List[Dict[str, Any]]:
     """Create retention policies for client"""
     policies = []
+    policy_rows = []
+    requirements = [
+        (category, months) for category, months in retention_requirements.items()
+        if category in data_categories
+    ]
+    policy_ids = _uuid4_batch(len(requirements))
     
-    for category, months in retention_requirements.items():
-        if category in data_categories:
-            policy = RetentionPolicy(
-                id=uuid.uuid4(),
-                name=f"Retention Policy - {category}",
-                retention_period_months=months,
-                applies_to_data_categories=[category],
-                applies_to_processing_purposes=["invoice_processing"],
-                legal_basis="French Commercial Code Article L123-22",
-                is_active=True,
-                effective_date=datetime.utcnow()
-            )
-            db.add(policy)
-            policies.append({
-                "policy_id": str(policy.id),
-                "category": category,
-                "retention_months": months
-            })
+    for policy_id, (category, months) in zip(policy_ids, requirements):
+        policy = RetentionPolicy(
+            id=policy_id,
+            name=f"Retention Policy - {category}",
+            retention_period_months=months,
+            applies_to_data_categories=[category],
+            applies_to_processing_purposes=["invoice_processing"],
+            legal_basis="French Commercial Code Article L123-22",
+            is_active=True,
+            effective_date=now
+        )
+        policy_rows.append(policy)
+        policies.append({
+            "policy_id": str(policy.id),
+            "category": category,
+            "retention_months": months
+        })
     
-    db.commit()
+    db.add_all(policy_rows)
+    await db.commit()
     return policies
 
 
 async def _assess_transfer_requirements(
     request: ClientOnboardingRequest, 
-    db: Session
+    db: AsyncSession
 ) -> Dict[str, Any]:
     """Assess third country transfer requirements"""
     context = TransferContext(
@@ -516,20 +579,20 @@ async def _send_onboarding_materials(
 async def _verify_data_subject_identity(
     email: str, 
     name: str, 
-    db: Session
+    db: AsyncSession
 ) -> Optional[DataSubject]:
     """Verify data subject identity"""
     # In real implementation, would use proper identity verification
     email_hash = gdpr_encryption.hash_for_indexing(email.lower())
     
-    data_subject = db.query(DataSubject).filter(
-        DataSubject.email_encrypted.contains(email_hash[:10])  # Simplified lookup
-    ).first()
+    result = await db.execute(
+        select(DataSubject).where(DataSubject.email_hash == email_hash).limit(1)
+    )
     
-    return data_subject
+    return result.scalar_one_or_none()
 
 
-async def _handle_access_request(data_subject: DataSubject, db: Session) -> Dict[str, Any]:
+async def _handle_access_request(data_subject: DataSubject, db: AsyncSession) -> Dict[str, Any]:
     """Handle data subject access request"""
     # Decrypt and return all personal data for the data subject
     decrypted_data = {
@@ -553,7 +616,7 @@ async def _handle_access_request(data_subject: DataSubject, db: Session) -> Dict
 async def _handle_rectification_request(
     data_subject: DataSubject, 
     corrections: Dict[str, Any], 
-    db: Session
+    db: AsyncSession
 ) -> Dict[str, Any]:
     """Handle data rectification request"""
     # Apply corrections to data subject record
@@ -565,25 +628,24 @@ async def _handle_rectification_request(
             updates_made.append("name")
         elif field == "email" and new_value:
             data_subject.email_encrypted = gdpr_encryption.encrypt_personal_data(new_value)["encrypted_data"]
+            data_subject.email_hash = gdpr_encryption.hash_for_indexing(new_value.lower())
             updates_made.append("email")
     
-    db.commit()
-    
+    # Committed by the caller together with the audit row
     return {"fields_updated": updates_made, "status": "completed"}
 
 
-async def _handle_erasure_request(data_subject: DataSubject, db: Session) -> Dict[str, Any]:
+async def _handle_erasure_request(data_subject: DataSubject, db: AsyncSession) -> Dict[str, Any]:
     """Handle right to erasure request"""
     # Mark data subject for deletion
     data_subject.retention_status = "scheduled_deletion"
     data_subject.retention_until = datetime.utcnow() + timedelta(days=30)  # Grace period
     
-    db.commit()
-    
+    # Committed by the caller together with the audit row
     return {"status": "scheduled_for_deletion", "deletion_date": data_subject.retention_until.isoformat()}
 
 
-async def _handle_portability_request(data_subject: DataSubject, db: Session) -> Dict[str, Any]:
+async def _handle_portability_request(data_subject: DataSubject, db: AsyncSession) -> Dict[str, Any]:
     """Handle data portability request"""
     # Export data in machine-readable format
     portable_data = {
@@ -598,25 +660,38 @@ async def _handle_portability_request(data_subject: DataSubject, db: Session) ->
     return {"portable_data": portable_data, "format": "JSON"}
 
 
-async def _handle_restriction_request(data_subject: DataSubject, db: Session) -> Dict[str, Any]:
+async def _handle_restriction_request(data_subject: DataSubject, db: AsyncSession) -> Dict[str, Any]:
     """Handle processing restriction request"""
     # Implement processing restriction
     return {"status": "processing_restricted", "effective_date": datetime.utcnow().isoformat()}
 
 
-async def _handle_objection_request(data_subject: DataSubject, db: Session) -> Dict[str, Any]:
+async def _handle_objection_request(data_subject: DataSubject, db: AsyncSession) -> Dict[str, Any]:
     """Handle objection to processing request"""
     # Stop processing based on legitimate interests
     return {"status": "processing_stopped", "effective_date": datetime.utcnow().isoformat()}
 
 
+# Rights request type -> handler(data_subject, request, db)
+_RIGHTS_HANDLERS = {
+    "access": lambda data_subject, request, db: _handle_access_request(data_subject, db),
+    "rectification": lambda data_subject, request, db: _handle_rectification_request(
+        data_subject, request.specific_requests, db
+    ),
+    "erasure": lambda data_subject, request, db: _handle_erasure_request(data_subject, db),
+    "portability": lambda data_subject, request, db: _handle_portability_request(data_subject, db),
+    "restriction": lambda data_subject, request, db: _handle_restriction_request(data_subject, db),
+    "objection": lambda data_subject, request, db: _handle_objection_request(data_subject, db)
+}
+
+
 async def _assess_notification_requirements(breach: BreachIncident) -> Dict[str, Any]:
     """Assess breach notification requirements"""
     # Determine if CNIL and data subject notifications are required
     cnil_required = breach.severity_level in ["high", "critical"]
     subjects_required = breach.severity_level == "critical"
     
-    deadline = datetime.utcnow() + timedelta(hours=72) if cnil_required else None
+    deadline = breach.discovery_date + timedelta(hours=72) if cnil_required else None
     
     return {
         "cnil_required": cnil_required,
@@ -625,37 +700,118 @@ async def _assess_notification_requirements(breach: BreachIncident) -> Dict[str,
     }
 
 
+async def _stream_audit_trail_json(
+    first_record: Optional[Dict[str, Any]],
+    audit_records: AsyncIterator[Dict[str, Any]],
+    query_parameters: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Frame streamed audit records, after the already fetched first one, as the audit trail JSON document"""
+    yield b'{"audit_records": ['
+    total_records = 0
+    if first_record is not None:
+        yield json.dumps(first_record).encode()
+        total_records = 1
+        async for record in audit_records:
+            yield b", "
+            yield json.dumps(record).encode()
+            total_records += 1
+    yield (
+        f'], "total_records": {total_records}, '
+        f'"query_parameters": {json.dumps(query_parameters)}}}'
+    ).encode()
+
+
+def _uuid4_batch(count: int) -> List[uuid.UUID]:
+    """Generate count random UUIDs from a single urandom read"""
+    random_bytes = os.urandom(16 * count)
+    return [
+        uuid.UUID(bytes=random_bytes[offset:offset + 16], version=4)
+        for offset in range(0, 16 * count, 16)
+    ]
+
+
+def _compliance_status_etag(component_results: List[Dict[str, Any]]) -> str:
+    """Weak ETag for a set of compliance component results, ignoring their volatile fields"""
+    stable_results = [
+        {key: value for key, value in result.items() if key not in _COMPLIANCE_VOLATILE_FIELDS}
+        for result in component_results
+    ]
+    digest = hashlib.blake2b(
+        json.dumps(stable_results, sort_keys=True, default=str).encode(),
+        digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
 def _has_audit_permissions(user: User) -> bool:
     """Check if user has audit trail access permissions"""
     # In real implementation, would check role-based permissions
     return True  # Simplified for example
 
 
-async def _check_dpa_status(db: Session) -> Dict[str, Any]:
+def _cached_compliance_check(check=None, *, uses_db: bool = False):
+    """
+    Reuse a compliance check result for _COMPLIANCE_CHECK_TTL_SECONDS
+    
+    Checks run concurrently and an AsyncSession cannot be shared between
+    concurrent tasks, so a check declared with uses_db=True gets its own
+    session when it actually runs; other checks are called without one.
+    """
+    def decorate(check):
+        @wraps(check)
+        async def wrapper() -> Dict[str, Any]:
+            cached = _compliance_check_cache.get(check.__name__)
+            now = time.monotonic()
+            if cached and cached[0] > now:
+                return cached[1]
+            if uses_db:
+                async with async_session_maker() as db:
+                    result = await check(db)
+            else:
+                result = await check()
+            _compliance_check_cache[check.__name__] = (now + _COMPLIANCE_CHECK_TTL_SECONDS, result)
+            return result
+        return wrapper
+    
+    return decorate(check) if check is not None else decorate
+
+
+def _invalidate_compliance_checks() -> None:
+    """Drop cached compliance checks after a compliance-relevant write"""
+    _compliance_check_cache.clear()
+
+
+@_cached_compliance_check
+async def _check_dpa_status() -> Dict[str, Any]:
     """Check Data Processing Agreement compliance status"""
     return {"compliant": True, "last_review": datetime.utcnow().isoformat(), "recommendations": []}
 
 
-async def _check_retention_compliance(db: Session) -> Dict[str, Any]:
+@_cached_compliance_check
+async def _check_retention_compliance() -> Dict[str, Any]:
     """Check data retention compliance"""
     return {"compliant": True, "policies_active": 5, "recommendations": []}
 
 
-async def _check_transfer_compliance(db: Session) -> Dict[str, Any]:
+@_cached_compliance_check
+async def _check_transfer_compliance() -> Dict[str, Any]:
     """Check international transfer compliance"""
     return {"compliant": True, "sccs_valid": True, "recommendations": []}
 
 
-async def _check_audit_compliance(db: Session) -> Dict[str, Any]:
+@_cached_compliance_check
+async def _check_audit_compliance() -> Dict[str, Any]:
     """Check audit logging compliance"""
     return {"compliant": True, "logs_complete": True, "recommendations": []}
 
 
-async def _check_breach_compliance(db: Session) -> Dict[str, Any]:
+@_cached_compliance_check
+async def _check_breach_compliance() -> Dict[str, Any]:
     """Check breach response compliance"""
     return {"compliant": True, "procedures_tested": True, "recommendations": []}
 
 
-async def _check_rights_compliance(db: Session) -> Dict[str, Any]:
+@_cached_compliance_check
+async def _check_rights_compliance() -> Dict[str, Any]:
     """Check data subject rights compliance"""
     return {"compliant": True, "response_times_met": True, "recommendations": []}
\ No newline at end of file
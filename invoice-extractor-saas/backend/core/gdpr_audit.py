@@ -7,15 +7,15 @@ Provides audit trails for all personal data processing activities
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, select
 from contextlib import asynccontextmanager
 import asyncio
 from fastapi import Request
 import logging
 
-from core.database import get_db
+from core.database import async_session_maker
 from models.gdpr_models import (
     AuditLog, AuditEventType, DataSubject, Invoice, 
     BreachIncident, ConsentRecord
@@ -23,6 +23,25 @@ from models.gdpr_models import (
 from models.user import User
 
 
+# Columns returned by the audit trail, selected directly so wide reads skip ORM hydration
+_AUDIT_TRAIL_COLUMNS = (
+    AuditLog.id,
+    AuditLog.event_type,
+    AuditLog.event_description,
+    AuditLog.event_timestamp,
+    AuditLog.user_id,
+    AuditLog.data_subject_id,
+    AuditLog.invoice_id,
+    AuditLog.processing_purpose,
+    AuditLog.legal_basis,
+    AuditLog.data_categories_accessed,
+    AuditLog.system_component,
+    AuditLog.operation_details,
+    AuditLog.risk_level,
+    AuditLog.compliance_notes
+)
+
+
 class GDPRAuditService:
     """
     Comprehensive audit service for GDPR compliance
@@ -60,21 +79,14 @@ class GDPRAuditService:
             Audit log ID
         """
         try:
-            audit_log = AuditLog(
-                id=uuid.uuid4(),
-                event_type=AuditEventType.DATA_ACCESS,
-                event_description=f"Data access for purpose: {purpose}",
-                user_id=uuid.UUID(user_id) if user_id else None,
-                data_subject_id=uuid.UUID(data_subject_id) if data_subject_id else None,
-                invoice_id=uuid.UUID(invoice_id) if invoice_id else None,
-                processing_purpose=purpose,
+            audit_log = self.build_data_access_event(
+                user_id=user_id,
+                data_subject_id=data_subject_id,
+                invoice_id=invoice_id,
+                purpose=purpose,
                 legal_basis=legal_basis,
-                data_categories_accessed=data_categories,
-                system_component="api",
-                user_ip_address=self._get_client_ip(request) if request else None,
-                user_agent=request.headers.get("user-agent") if request else None,
-                session_id=self._get_session_id(request) if request else None,
-                risk_level="low"
+                data_categories=data_categories,
+                request=request
             )
             
             if db:
@@ -91,6 +103,34 @@ class GDPRAuditService:
             self.logger.error(f"Failed to log data access: {str(e)}")
             raise
     
+    def build_data_access_event(
+        self,
+        user_id: str,
+        data_subject_id: Optional[str] = None,
+        invoice_id: Optional[str] = None,
+        purpose: str = None,
+        legal_basis: str = None,
+        data_categories: List[str] = None,
+        request: Optional[Request] = None
+    ) -> AuditLog:
+        """Build the data access audit row without writing it, for callers that commit it with their own changes"""
+        return AuditLog(
+            id=uuid.uuid4(),
+            event_type=AuditEventType.DATA_ACCESS,
+            event_description=f"Data access for purpose: {purpose}",
+            user_id=uuid.UUID(user_id) if user_id else None,
+            data_subject_id=uuid.UUID(data_subject_id) if data_subject_id else None,
+            invoice_id=uuid.UUID(invoice_id) if invoice_id else None,
+            processing_purpose=purpose,
+            legal_basis=legal_basis,
+            data_categories_accessed=data_categories,
+            system_component="api",
+            user_ip_address=self._get_client_ip(request) if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+            session_id=self._get_session_id(request) if request else None,
+            risk_level="low"
+        )
+    
     async def log_data_modification(
         self,
         user_id: str,
@@ -298,28 +338,9 @@ class GDPRAuditService:
             Audit log ID
         """
         try:
-            event_type = (AuditEventType.CONSENT_GIVEN 
-                         if consent_given 
-                         else AuditEventType.CONSENT_WITHDRAWN)
-            
-            audit_log = AuditLog(
-                id=uuid.uuid4(),
-                event_type=event_type,
-                event_description=f"Consent {'given' if consent_given else 'withdrawn'} for: {', '.join(consent_purposes)}",
-                user_id=uuid.UUID(user_id) if user_id else None,
-                data_subject_id=uuid.UUID(data_subject_id),
-                processing_purpose=", ".join(consent_purposes),
-                legal_basis="consent",
-                system_component="consent_service",
-                operation_details={
-                    "consent_given": consent_given,
-                    "consent_purposes": consent_purposes,
-                    "consent_mechanism": consent_mechanism
-                },
-                user_ip_address=self._get_client_ip(request) if request else None,
-                user_agent=request.headers.get("user-agent") if request else None,
-                session_id=self._get_session_id(request) if request else None,
-                risk_level="medium"
+            audit_log = self.build_consent_event(
+                data_subject_id, consent_given, consent_purposes,
+                consent_mechanism, user_id, request
             )
             
             if db:
@@ -336,6 +357,40 @@ class GDPRAuditService:
             self.logger.error(f"Failed to log consent event: {str(e)}")
             raise
     
+    def build_consent_event(
+        self,
+        data_subject_id: str,
+        consent_given: bool,
+        consent_purposes: List[str],
+        consent_mechanism: str = "web_form",
+        user_id: Optional[str] = None,
+        request: Optional[Request] = None
+    ) -> AuditLog:
+        """Build the consent audit row without writing it, for callers that commit it with their own changes"""
+        event_type = (AuditEventType.CONSENT_GIVEN 
+                     if consent_given 
+                     else AuditEventType.CONSENT_WITHDRAWN)
+        
+        return AuditLog(
+            id=uuid.uuid4(),
+            event_type=event_type,
+            event_description=f"Consent {'given' if consent_given else 'withdrawn'} for: {', '.join(consent_purposes)}",
+            user_id=uuid.UUID(user_id) if user_id else None,
+            data_subject_id=uuid.UUID(data_subject_id),
+            processing_purpose=", ".join(consent_purposes),
+            legal_basis="consent",
+            system_component="consent_service",
+            operation_details={
+                "consent_given": consent_given,
+                "consent_purposes": consent_purposes,
+                "consent_mechanism": consent_mechanism
+            },
+            user_ip_address=self._get_client_ip(request) if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+            session_id=self._get_session_id(request) if request else None,
+            risk_level="medium"
+        )
+    
     async def log_breach_detected(
         self,
         breach_type: str,
@@ -449,35 +504,54 @@ class GDPRAuditService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """Internal method to query audit trail"""
+        return [
+            record async for record in self.stream_audit_trail(
+                db, data_subject_id, invoice_id, user_id,
+                event_types, start_date, end_date, limit
+            )
+        ]
+    
+    async def stream_audit_trail(
+        self,
+        db: Session,
+        data_subject_id: Optional[str] = None,
+        invoice_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        event_types: List[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield audit trail records one at a time as they are read from the database"""
         
-        query = db.query(AuditLog)
+        query = select(*_AUDIT_TRAIL_COLUMNS)
         
         # Apply filters
         if data_subject_id:
-            query = query.filter(AuditLog.data_subject_id == uuid.UUID(data_subject_id))
+            query = query.where(AuditLog.data_subject_id == uuid.UUID(data_subject_id))
         
         if invoice_id:
-            query = query.filter(AuditLog.invoice_id == uuid.UUID(invoice_id))
+            query = query.where(AuditLog.invoice_id == uuid.UUID(invoice_id))
         
         if user_id:
-            query = query.filter(AuditLog.user_id == uuid.UUID(user_id))
+            query = query.where(AuditLog.user_id == uuid.UUID(user_id))
         
         if event_types:
-            query = query.filter(AuditLog.event_type.in_(event_types))
+            query = query.where(AuditLog.event_type.in_(event_types))
         
         if start_date:
-            query = query.filter(AuditLog.event_timestamp >= start_date)
+            query = query.where(AuditLog.event_timestamp >= start_date)
         
         if end_date:
-            query = query.filter(AuditLog.event_timestamp <= end_date)
+            query = query.where(AuditLog.event_timestamp <= end_date)
         
         # Order by timestamp descending and limit
-        audit_logs = query.order_by(desc(AuditLog.event_timestamp)).limit(limit).all()
+        query = query.order_by(desc(AuditLog.event_timestamp)).limit(limit)
+        rows = await db.stream(query.execution_options(yield_per=1000))
         
         # Convert to dictionaries
-        result = []
-        for log in audit_logs:
-            result.append({
+        async for log in rows:
+            yield {
                 "id": str(log.id),
                 "event_type": log.event_type.value,
                 "event_description": log.event_description,
@@ -492,9 +566,7 @@ class GDPRAuditService:
                 "operation_details": log.operation_details,
                 "risk_level": log.risk_level,
                 "compliance_notes": log.compliance_notes
-            })
-        
-        return result
+            }
     
     def _get_client_ip(self, request: Request) -> Optional[str]:
         """Extract client IP address from request"""
@@ -532,11 +604,8 @@ class GDPRAuditService:
     @asynccontextmanager
     async def _get_db_session(self):
         """Get database session for async operations"""
-        db = next(get_db())
-        try:
+        async with async_session_maker() as db:
             yield db
-        finally:
-            db.close()
 
 
 # Global audit service instance
@@ -10,7 +10,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from enum import Enum
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.gdpr_encryption import transit_encryption, gdpr_encryption
@@ -64,7 +65,7 @@ class GDPRTransferCompliance:
     async def assess_transfer_risk(
         self,
         context: TransferContext,
-        db: Session
+        db: AsyncSession
     ) -> Dict[str, Any]:
         """
         Conduct transfer impact assessment per GDPR Article 46
@@ -265,7 +266,7 @@ class GDPRTransferCompliance:
         invoice_data: Dict[str, Any],
         context: TransferContext,
         assessment_id: str,
-        db: Session
+        db: AsyncSession
     ) -> Dict[str, Any]:
         """
         Prepare data package for compliant transfer to Claude API
@@ -339,7 +340,7 @@ class GDPRTransferCompliance:
     async def validate_scc_compliance(
         self,
         transfer_id: str,
-        db: Session
+        db: AsyncSession
     ) -> Dict[str, Any]:
         """
         Validate Standard Contractual Clauses compliance for transfer
@@ -424,7 +425,7 @@ class GDPRTransferCompliance:
     async def monitor_transfer_compliance(
         self,
         assessment_id: str,
-        db: Session
+        db: AsyncSession
     ) -> Dict[str, Any]:
         """
         Monitor ongoing compliance for approved transfers
@@ -438,9 +439,12 @@ class GDPRTransferCompliance:
         """
         try:
             # Retrieve assessment
-            assessment = db.query(TransferRiskAssessment).filter(
-                TransferRiskAssessment.id == uuid.UUID(assessment_id)
-            ).first()
+            result = await db.execute(
+                select(TransferRiskAssessment).where(
+                    TransferRiskAssessment.id == uuid.UUID(assessment_id)
+                )
+            )
+            assessment = result.scalar_one_or_none()
             
             if not assessment:
                 raise Exception(f"Transfer assessment {assessment_id} not found")
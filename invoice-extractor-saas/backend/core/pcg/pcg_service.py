@@ -129,6 +129,32 @@ class PlanComptableGeneralService:
         logger.info(f"Using default account: {default_result.account_code}")
         return default_result
     
+    def map_line_items_batch(self, line_items: List[LineItem], use_ai: bool = True) -> List[PCGMappingResult]:
+        """
+        Map all line items of an invoice to French accounting codes in one call
+        
+        Items sharing a description and total map to the same account, so each
+        distinct pair is mapped once and its result reused.
+        
+        Args:
+            line_items: Invoice line items to map
+            use_ai: Whether to use AI-powered mapping (fallback to keyword mapping if False)
+            
+        Returns:
+            PCGMappingResult for each line item, in the same order
+        """
+        mapped: Dict[Tuple[str, float], PCGMappingResult] = {}
+        results = []
+        
+        for line_item in line_items:
+            key = (line_item.description, line_item.total)
+            result = mapped.get(key)
+            if result is None:
+                result = mapped[key] = self.map_line_item_to_account(line_item, use_ai=use_ai)
+            results.append(result)
+        
+        return results
+    
     def get_tva_account(self, tva_rate: float, is_deductible: bool = True) -> str:
         """
         Get appropriate TVA account code based on rate and type
@@ -471,7 +497,7 @@ def map_invoice_line_items(line_items: List[LineItem], db_session: Session) -> L
         List of PCG mapping results
     """
     pcg_service = get_pcg_service(db_session)
-    return [pcg_service.map_line_item_to_account(item) for item in line_items]
+    return pcg_service.map_line_items_batch(line_items)
 
 
 # ==========================================
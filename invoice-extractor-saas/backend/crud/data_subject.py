@@ -14,6 +14,7 @@ from models.gdpr_models import (
     RetentionStatus, AuditEventType, ConsentRecord
 )
 from core.gdpr_helpers import encrypt_data, decrypt_data, log_audit_event
+from core.gdpr_encryption import gdpr_encryption
 
 
 async def create_data_subject(
@@ -45,6 +46,7 @@ async def create_data_subject(
         data_subject = DataSubject(
             name_encrypted=name_encrypted,
             email_encrypted=email_encrypted,
+            email_hash=gdpr_encryption.hash_for_indexing(email.lower()) if email else None,
             phone_encrypted=phone_encrypted,
             address_encrypted=address_encrypted,
             data_subject_type=data_subject_type,
@@ -253,6 +255,8 @@ async def update_data_subject(
                 else:
                     setattr(data_subject, encrypted_field, None)
                     updated_fields.append(field)
+                if field == 'email':
+                    data_subject.email_hash = gdpr_encryption.hash_for_indexing(value.lower()) if value else None
         
         # Handle non-PII fields
         for key, value in kwargs.items():
@@ -81,6 +81,7 @@ class DataSubject(Base):
     # Encrypted personal data fields
     name_encrypted = Column(Text, nullable=False)  # AES encrypted
     email_encrypted = Column(Text, nullable=True)  # AES encrypted
+    email_hash = Column(String(64), nullable=True, index=True)  # Blind index for exact email lookups
     phone_encrypted = Column(Text, nullable=True)  # AES encrypted
     address_encrypted = Column(Text, nullable=True)  # AES encrypted
     
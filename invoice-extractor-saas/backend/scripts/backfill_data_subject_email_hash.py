@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Backfill the email_hash blind index of existing data subjects
+
+Migration a7d3c1e9f042 adds data_subjects.email_hash, which data subject
+rights requests look subjects up by. Rows created before it have no hash and
+could not be found, so run this once after the migration and before deploying
+the code that reads the column. It only fills rows whose hash is missing, so
+it can be re-run safely.
+
+Usage:
+    python scripts/backfill_data_subject_email_hash.py [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from core.database import async_session_maker
+from core.gdpr_encryption import gdpr_encryption
+from models.gdpr_models import DataSubject
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_email_hashes(batch_size: int = 500) -> int:
+    """
+    Compute email_hash for every data subject with an email but no hash
+
+    Rows are read in primary key order, one batch per transaction.
+
+    Returns:
+        Number of rows updated
+    """
+    updated = 0
+    failed = 0
+    last_id = None
+
+    while True:
+        async with async_session_maker() as db:
+            query = (
+                select(DataSubject)
+                .where(DataSubject.email_hash.is_(None), DataSubject.email_encrypted.isnot(None))
+                .order_by(DataSubject.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(DataSubject.id > last_id)
+
+            result = await db.execute(query)
+            data_subjects = result.scalars().all()
+            if not data_subjects:
+                break
+
+            for data_subject in data_subjects:
+                try:
+                    email = gdpr_encryption.decrypt_personal_data(data_subject.email_encrypted)
+                except Exception as e:
+                    # Left without a hash and skipped by later batches
+                    logger.error(f"Could not decrypt email of data subject {data_subject.id}: {e}")
+                    failed += 1
+                    continue
+                data_subject.email_hash = gdpr_encryption.hash_for_indexing(email.lower()) if email else None
+                updated += 1
+
+            await db.commit()
+            last_id = data_subjects[-1].id
+            logger.info(f"Backfilled {updated} data subjects so far")
+
+    if failed:
+        logger.warning(f"{failed} data subjects could not be decrypted and still have no email_hash")
+
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill data_subjects.email_hash")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    count = asyncio.run(backfill_email_hashes(args.batch_size))
+    print(f"✅ email_hash backfilled for {count} data subjects")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test that exporters round float and Decimal amounts the same way
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from api.exports.ebp_exporter import EBPExporter
+from api.exports.fec_exporter import FECExporter
+
+# Half-cent amounts: 0.125 is exact in binary, 2.675 and 1.005 are stored just below
+HALF_CENT_AMOUNTS = (
+    ('0.125', '0.13'),
+    ('2.675', '2.68'),
+    ('1.005', '1.01'),
+    ('-0.125', '-0.13'),
+)
+
+
+def test_fec_half_cent_rounding():
+    """FEC rounds half-cents up for floats and Decimals alike"""
+    exporter = FECExporter()
+    for amount, expected in HALF_CENT_AMOUNTS:
+        assert exporter._format_fec_amount(float(amount)) == expected
+        assert exporter._format_fec_amount(Decimal(amount)) == expected
+
+
+def test_ebp_half_cent_rounding():
+    """EBP rounds half-cents up for floats and Decimals alike"""
+    exporter = EBPExporter()
+    for amount, expected in HALF_CENT_AMOUNTS:
+        cents = int(Decimal(expected) * 100)
+        assert exporter._format_amount_ebp(float(amount)) == f"{cents:+013d}".rjust(15)
+        assert exporter._format_amount_ebp(Decimal(amount)) == f"{cents:+013d}".rjust(15)
+
+
+def test_whole_amounts():
+    """Whole amounts are written with two zero decimals"""
+    assert FECExporter()._format_fec_amount(12) == '12.00'
+    assert EBPExporter()._format_amount_ebp(12) == '  +000000001200'
+
+
+if __name__ == "__main__":
+    test_fec_half_cent_rounding()
+    test_ebp_half_cent_rounding()
+    test_whole_amounts()
+    print("All amount rounding tests passed")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test the date parsing shared by the accounting exporters
+"""
+
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from api.exports.dates import parse_date_string
+
+
+def test_iso_and_french_dates():
+    """Zero-padded ISO and French dates give the same day"""
+    assert parse_date_string('2024-03-05') == date(2024, 3, 5)
+    assert parse_date_string('05/03/2024') == date(2024, 3, 5)
+
+
+def test_unpadded_dates():
+    """Unpadded days and months are accepted in both formats"""
+    assert parse_date_string('2024-3-5') == date(2024, 3, 5)
+    assert parse_date_string('5/3/2024') == date(2024, 3, 5)
+
+
+def test_impossible_dates():
+    """Days and months that do not exist are rejected"""
+    assert parse_date_string('2024-02-30') is None
+    assert parse_date_string('31/04/2024') is None
+    assert parse_date_string('2024-13-01') is None
+
+
+def test_unrecognised_strings():
+    """Other layouts and free text are rejected"""
+    assert parse_date_string('') is None
+    assert parse_date_string('20240305') is None
+    assert parse_date_string('2024/03/05') is None
+    assert parse_date_string('05-03-2024') is None
+    assert parse_date_string('2024-０3-05') is None
+    assert parse_date_string('mars 2024') is None
+
+
+if __name__ == "__main__":
+    test_iso_and_french_dates()
+    test_unpadded_dates()
+    test_impossible_dates()
+    test_unrecognised_strings()
+    print("All date parsing tests passed")
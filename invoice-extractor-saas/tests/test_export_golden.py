@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Golden-output tests for the accounting exports
+
+Each format's single-invoice download is compared byte for byte with a file
+in tests/golden/. The invoice has accented names, a '|' and a newline in its
+descriptions and three TVA rates, and is built once from floats and once from
+Decimals. Today's date and the Sage export timestamp are masked.
+
+After an intended format change, regenerate the files with:
+    python tests/test_export_golden.py --update
+"""
+
+import os
+import re
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from schemas.invoice import InvoiceData, FrenchBusinessInfo, FrenchTVABreakdown, LineItem
+from api.exports.ebp_exporter import export_to_ebp_ascii_bytes
+from api.exports.fec_exporter import export_to_fec
+from api.exports.sage_exporter import export_to_sage_pnm_bytes
+from api.exports.ciel_exporter import export_to_ciel_ximport
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden')
+
+# Golden file and exporter for each format, returning the bytes the download routes serve
+FORMATS = {
+    'ebp': ('ebp.txt', export_to_ebp_ascii_bytes),
+    'fec': ('fec.txt', lambda invoice: export_to_fec(invoice).encode('utf-8')),
+    'sage': ('sage.pnm', export_to_sage_pnm_bytes),
+    'ciel': ('ciel.txt', lambda invoice: export_to_ciel_ximport(invoice).encode('utf-8')),
+}
+
+# Sage batch reference timestamp, e.g. 15/03/2024_143000
+SAGE_TIMESTAMP = re.compile(rb'\d{2}/\d{2}/\d{4}_\d{6}')
+
+
+def _invoice(amount=float):
+    return InvoiceData(
+        invoice_number="FA-2024-0042",
+        date="2024-03-15",
+        due_date="2024-04-14",
+        vendor=FrenchBusinessInfo(
+            name="Société Générale d'Équipement",
+            siren_number="552100554",
+            siret_number="55210055400013",
+            tva_number="FR43552100554",
+            address="12 rue de la Paix",
+            postal_code="75002",
+            city="Paris",
+            country="France"
+        ),
+        customer=FrenchBusinessInfo(name="Café des Arts", siren_number="732829320", city="Lyon"),
+        line_items=[
+            LineItem(description="Prestation de conseil | audit", quantity=2,
+                     unit_price=amount("500.00"), total=amount("1000.00"), tva_rate=20.0),
+            LineItem(description="Matériel\ninformatique", quantity=3,
+                     unit_price=amount("111.11"), total=amount("333.33"), tva_rate=10.0),
+            LineItem(description="Livres scolaires", quantity=4,
+                     unit_price=amount("11.85"), total=amount("47.40"), tva_rate=5.5),
+        ],
+        subtotal_ht=amount("1380.73"),
+        total_tva=amount("235.94"),
+        total_ttc=amount("1616.67"),
+        tva_breakdown=[
+            FrenchTVABreakdown(rate=20.0, taxable_amount=amount("1000.00"), tva_amount=amount("200.00")),
+            FrenchTVABreakdown(rate=10.0, taxable_amount=amount("333.33"), tva_amount=amount("33.33")),
+            FrenchTVABreakdown(rate=5.5, taxable_amount=amount("47.40"), tva_amount=amount("2.61")),
+        ]
+    )
+
+
+def _scrub(content):
+    """Mask the export date and time, which change from run to run"""
+    content = SAGE_TIMESTAMP.sub(b'<TIMESTAMP>', content)
+    today = datetime.now()
+    for date_format in ('%d/%m/%Y', '%Y%m%d'):
+        content = content.replace(today.strftime(date_format).encode('ascii'), b'<TODAY>')
+    return content
+
+
+def _export(export_format, amount=float):
+    _, export = FORMATS[export_format]
+    return _scrub(export(_invoice(amount)))
+
+
+def _golden(export_format):
+    filename, _ = FORMATS[export_format]
+    with open(os.path.join(GOLDEN_DIR, filename), 'rb') as f:
+        return f.read()
+
+
+def test_ebp_golden():
+    """EBP output matches the golden file, Windows-1252 encoded"""
+    assert _export('ebp') == _golden('ebp')
+
+
+def test_fec_golden():
+    """FEC output matches the golden file"""
+    assert _export('fec') == _golden('fec')
+
+
+def test_sage_golden():
+    """Sage 100 PNM output matches the golden file, Windows-1252 encoded"""
+    assert _export('sage') == _golden('sage')
+
+
+def test_ciel_golden():
+    """Ciel XIMPORT output matches the golden file"""
+    assert _export('ciel') == _golden('ciel')
+
+
+def test_decimal_amounts_match_float():
+    """An invoice built from Decimal amounts exports exactly like the float one"""
+    for export_format in FORMATS:
+        assert _export(export_format, Decimal) == _export(export_format), export_format
+
+
+def _update_goldens():
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for export_format, (filename, _) in FORMATS.items():
+        with open(os.path.join(GOLDEN_DIR, filename), 'wb') as f:
+            f.write(_export(export_format))
+        print(f"Wrote {filename}")
+
+
+if __name__ == "__main__":
+    if '--update' in sys.argv:
+        _update_goldens()
+        sys.exit(0)
+    test_ebp_golden()
+    test_fec_golden()
+    test_sage_golden()
+    test_ciel_golden()
+    test_decimal_amounts_match_float()
+    print("All golden export tests passed")
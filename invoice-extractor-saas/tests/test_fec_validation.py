@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test FEC compliance validation of entry dicts, rows and exported files
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from schemas.invoice import InvoiceData, FrenchBusinessInfo, FrenchTVABreakdown, LineItem
+from api.exports.fec_exporter import FECExporter, validate_fec_file
+
+
+def _invoice():
+    return InvoiceData(
+        invoice_number="FA-2024-0001",
+        date="2024-03-15",
+        vendor=FrenchBusinessInfo(name="Fournisseur SARL", siren_number="552100554"),
+        line_items=[LineItem(description="Prestation de conseil", quantity=2, unit_price=500.0, total=1000.0)],
+        subtotal_ht=1000.0,
+        total_tva=200.0,
+        total_ttc=1200.0,
+        tva_breakdown=[FrenchTVABreakdown(rate=20.0, taxable_amount=1000.0, tva_amount=200.0)]
+    )
+
+
+def _entry_dicts(exporter):
+    lines = exporter.export_invoice(_invoice()).split('\n')
+    return [dict(zip(exporter.fec_headers, line.split(exporter.separator))) for line in lines[1:] if line]
+
+
+def test_dict_entries_match_rows():
+    """Entry dicts and the same entries as rows give the same report"""
+    exporter = FECExporter()
+    entries = _entry_dicts(exporter)
+    rows = [[entry[field] for field in exporter.fec_headers] for entry in entries]
+
+    result = exporter.validate_fec_compliance(entries)
+
+    assert result == exporter.validate_fec_compliance_rows(rows)
+    assert result['is_compliant']
+    assert result['total_entries'] == len(entries)
+
+
+def test_dict_entries_report_errors():
+    """Missing fields and bad numbers in entry dicts are reported, not raised"""
+    exporter = FECExporter()
+    entries = _entry_dicts(exporter)
+    del entries[0]['CompteNum']
+    entries[1]['EcritureNum'] = 'X'
+
+    result = exporter.validate_fec_compliance(entries)
+
+    assert not result['is_compliant']
+    assert "Missing required field 'CompteNum' in entry 1" in result['errors']
+    assert "Invalid entry number in entry 2: X" in result['errors']
+
+
+def test_exported_file_is_compliant():
+    """A batch export validates as a FEC file"""
+    exporter = FECExporter()
+    result = validate_fec_file(exporter.export_batch([_invoice(), _invoice()]))
+
+    assert result['is_compliant'], result['errors']
+
+
+if __name__ == "__main__":
+    test_dict_entries_match_rows()
+    test_dict_entries_report_errors()
+    test_exported_file_is_compliant()
+    print("All FEC validation tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the Sage exporter's PCG service mapping when a single line item fails
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from schemas.invoice import InvoiceData, FrenchBusinessInfo, FrenchTVABreakdown, LineItem
+from core.pcg.pcg_service import PlanComptableGeneralService, PCGMappingResult
+from api.exports.sage_exporter import EnhancedSageExporter
+
+FAILING_DESCRIPTION = "Article illisible"
+
+
+class FakePCGService:
+    """PCG service that maps everything to 604000 but raises on one description"""
+    map_line_items_batch = PlanComptableGeneralService.map_line_items_batch
+
+    def map_line_item_to_account(self, line_item, use_ai=True):
+        if line_item.description == FAILING_DESCRIPTION:
+            raise RuntimeError("mapping failed")
+        return PCGMappingResult(
+            account_code="604000",
+            account_name="Achats d'études et prestations de services",
+            confidence_score=0.95,
+            mapping_source="keyword",
+            category="charges"
+        )
+
+
+def _exporter():
+    exporter = EnhancedSageExporter()
+    exporter.pcg_service = FakePCGService()
+    return exporter
+
+
+def _line_items():
+    return [
+        LineItem(description="Prestation de conseil", quantity=2, unit_price=500.0, total=1000.0),
+        LineItem(description=FAILING_DESCRIPTION, quantity=1, unit_price=100.0, total=100.0),
+        LineItem(description="Logiciel comptable", quantity=1, unit_price=200.0, total=200.0),
+    ]
+
+
+def test_failing_item_falls_back_alone():
+    """Only the item the service cannot map gets the legacy mapping"""
+    exporter = _exporter()
+    line_items = _line_items()
+
+    accounts = exporter._determine_pcg_expense_accounts(line_items)
+
+    assert [account for account, _, _ in accounts] == [
+        "604000",
+        exporter._determine_pcg_expense_account(FAILING_DESCRIPTION)[0],
+        "604000",
+    ]
+
+
+def test_export_keeps_service_accounts():
+    """The exported entries keep the service accounts of the items that mapped"""
+    invoice = InvoiceData(
+        invoice_number="FA-2024-0001",
+        date="2024-03-15",
+        vendor=FrenchBusinessInfo(name="Fournisseur SARL"),
+        line_items=_line_items(),
+        subtotal_ht=1300.0,
+        total_tva=260.0,
+        total_ttc=1560.0,
+        tva_breakdown=[FrenchTVABreakdown(rate=20.0, taxable_amount=1300.0, tva_amount=260.0)]
+    )
+
+    entries = _exporter()._generate_accounting_entries(invoice)
+    expense_accounts = [entry.account_number for entry in entries[1:4]]
+
+    assert expense_accounts[0] == "604000"
+    assert expense_accounts[2] == "604000"
+
+
+if __name__ == "__main__":
+    test_failing_item_falls_back_alone()
+    test_export_keeps_service_accounts()
+    print("All PCG mapping tests passed")
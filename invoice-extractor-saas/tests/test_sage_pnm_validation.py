@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test the final validation of generated Sage 100 PNM lines
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from schemas.invoice import InvoiceData
+from api.exports.sage_exporter import EnhancedSageExporter
+
+HEADER = "SAGE;100;PNM;15/03/2024;1;INVOICE_AI_EXPORT_FR_FA-1_15/03/2024_120000"
+ENTRY = "ACH;15/03/2024;FA-1;401000;FFOURNISSEUR;0,00;120,00;Facture FA-1;15/03/2024;1"
+FOOTER = "TOTAL;120,00;120,00;1"
+
+
+def _validate(entry_line):
+    exporter = EnhancedSageExporter()
+    return exporter._validate_generated_pnm([HEADER, entry_line, FOOTER], InvoiceData(), [])
+
+
+def test_well_formed_entry():
+    """An entry line with the 10 PNM fields passes"""
+    result = _validate(ENTRY)
+
+    assert result.is_valid
+    assert result.errors == []
+
+
+def test_stray_separator_in_entry():
+    """A separator left in free text adds a field and is reported"""
+    result = _validate(ENTRY.replace("Facture FA-1", "Facture; FA-1"))
+
+    assert not result.is_valid
+    assert result.errors == ["Ligne 1: nombre de champs excessif (11/10)"]
+
+
+def test_missing_fields_in_entry():
+    """An entry line with too few fields is reported"""
+    result = _validate("ACH;15/03/2024;FA-1")
+
+    assert not result.sage_import_ready
+    assert result.errors == ["Ligne 1: nombre de champs insuffisant (3/10)"]
+
+
+if __name__ == "__main__":
+    test_well_formed_entry()
+    test_stray_separator_in_entry()
+    test_missing_fields_in_entry()
+    print("All PNM validation tests passed")